@@ -3,9 +3,11 @@ from .models import Category
 from .models import Post
 from .models import Location
 from .models import Comment
+from .models import Job
 
 admin.site.register(Post)
 admin.site.register(Location)
 admin.site.register(Category)
 admin.site.register(Comment)
+admin.site.register(Job)
 # Register your models here.
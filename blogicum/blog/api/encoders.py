@@ -0,0 +1,73 @@
+import json
+from itertools import islice
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Столько строк кодируется одним вызовом, и примерно столько байт копится
+# в буфере, прежде чем уйти клиенту.
+CHUNK_ROWS = 256
+CHUNK_BYTES = 64 * 1024
+
+
+def _default(value):
+    # Формат как у orjson с OPT_UTC_Z: ISO 8601 с микросекундами, UTC — «Z».
+    if hasattr(value, "isoformat"):
+        text = value.isoformat()
+        return f"{text[:-6]}Z" if text.endswith("+00:00") else text
+    raise TypeError(
+        f"Object of type {type(value).__name__} is not JSON serializable"
+    )
+
+
+_encoder = json.JSONEncoder(
+    ensure_ascii=False, separators=(",", ":"), default=_default
+)
+
+
+def dumps(value):
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_UTC_Z)
+    return _encoder.encode(value).encode()
+
+
+class RowEncoder:
+    # Строки — кортежи из values_list(): ни экземпляров моделей, ни словарей
+    # на каждую строку от ORM. Объекты собираются только из нужных столбцов
+    # и кодируются пачками прямо в байты.
+
+    def __init__(self, names, positions, converters=None):
+        self.columns = list(zip(names, positions))
+        self.converters = [
+            (name, converter)
+            for name, converter in (converters or {}).items()
+            if name in names
+        ]
+
+    def objects(self, rows):
+        for row in rows:
+            item = {name: row[position] for name, position in self.columns}
+            for name, converter in self.converters:
+                item[name] = converter(item[name])
+            yield item
+
+    def stream(self, rows, head=b"[", tail=b"]"):
+        rows = iter(rows)
+        buffer = bytearray(head)
+        separator = False
+        while True:
+            chunk = list(self.objects(islice(rows, CHUNK_ROWS)))
+            if not chunk:
+                break
+            if separator:
+                buffer += b","
+            # Без внешних скобок: пачки склеиваются в один массив.
+            buffer += memoryview(dumps(chunk))[1:-1]
+            separator = True
+            if len(buffer) >= CHUNK_BYTES:
+                yield bytes(buffer)
+                buffer.clear()
+        buffer += tail
+        yield bytes(buffer)
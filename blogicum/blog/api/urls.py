@@ -0,0 +1,24 @@
+from django.urls import path
+
+from . import views
+
+app_name = "api"
+
+urlpatterns = [
+    path("posts/", views.PostListApiView.as_view(), name="post_list"),
+    path(
+        "posts/<int:post_id>/",
+        views.PostDetailApiView.as_view(),
+        name="post_detail",
+    ),
+    path(
+        "posts/<int:post_id>/comments/",
+        views.CommentListApiView.as_view(),
+        name="comment_list",
+    ),
+    path(
+        "categories/<slug:category_slug>/posts/",
+        views.CategoryPostListApiView.as_view(),
+        name="category_post_list",
+    ),
+]
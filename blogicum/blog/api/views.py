@@ -0,0 +1,204 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Case, F, When
+from django.http import (
+    Http404,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.shortcuts import get_object_or_404
+from django.views import View
+
+from ..models import Category, Post
+from ..paginators import KeysetPaginator
+from ..views import get_posts
+from .encoders import RowEncoder, dumps
+
+# Имя поля в ответе и путь к нему для values_list(): связи отдаются
+# человекочитаемым ключом, а не id.
+POST_FIELDS = {
+    "id": "id",
+    "title": "title",
+    "text": "text",
+    "pub_date": "pub_date",
+    "updated_at": "updated_at",
+    "author": "author__username",
+    "category": "category__slug",
+    "location": "published_location",
+    "image": "image",
+    "comment_count": "comment_count",
+}
+POST_ANNOTATIONS = {
+    # Снятое с публикации местоположение сайт не показывает, API тоже.
+    "published_location": Case(
+        When(location__is_published=True, then=F("location__name"))
+    ),
+}
+COMMENT_FIELDS = {
+    "id": "id",
+    "post": "post_id",
+    "author": "author__username",
+    "text": "text",
+    "created_at": "created_at",
+}
+
+
+class ApiError(Exception):
+    status = 400
+
+
+def image_url(name):
+    return Post._meta.get_field("image").storage.url(name) if name else None
+
+
+class ApiView(View):
+    http_method_names = ["get", "head", "options"]
+    fields = None
+    annotations = {}
+    converters = {}
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except Http404:
+            return JsonResponse({"detail": "Не найдено."}, status=404)
+        except ApiError as error:
+            return JsonResponse({"detail": str(error)}, status=error.status)
+
+    def get_field_names(self):
+        raw = self.request.GET.get("fields")
+        if not raw:
+            return list(self.fields)
+        names = list(
+            dict.fromkeys(
+                name.strip() for name in raw.split(",") if name.strip()
+            )
+        )
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ApiError(
+                f"Неизвестные поля: {', '.join(unknown)}. "
+                f"Доступны: {', '.join(self.fields)}."
+            )
+        return names
+
+    def get_columns(self, names, extra=()):
+        columns = [*(self.fields[name] for name in names), *extra]
+        return list(dict.fromkeys(columns))
+
+    def get_rows(self, queryset, columns):
+        # Кортежи values_list() вместо экземпляров моделей: ни объектов, ни
+        # лишних столбцов, аннотации — только для запрошенных полей.
+        annotations = {
+            alias: expression
+            for alias, expression in self.annotations.items()
+            if alias in columns
+        }
+        return queryset.annotate(**annotations).values_list(*columns)
+
+    def get_encoder(self, names, columns):
+        positions = [columns.index(self.fields[name]) for name in names]
+        return RowEncoder(names, positions, self.converters)
+
+
+class ApiListView(ApiView):
+    queryset = None
+    ordering = None
+
+    def get_queryset(self):
+        # Как в MultipleObjectMixin: queryset копируется для каждого запроса.
+        if self.queryset is None:
+            raise ImproperlyConfigured(
+                f"{type(self).__name__}: задайте queryset "
+                "или переопределите get_queryset()."
+            )
+        return self.queryset.all()
+
+    def get(self, request, *args, **kwargs):
+        names = self.get_field_names()
+        # Поля курсора выбираются всегда, даже если их нет в fields=.
+        columns = self.get_columns(
+            names, extra=[name.lstrip("-") for name in self.ordering]
+        )
+        paginator = KeysetPaginator(
+            self.get_rows(self.get_queryset(), columns),
+            settings.BLOG_API_PAGE_SIZE,
+            ordering=self.ordering,
+            columns=columns,
+        )
+        page = paginator.get_page(
+            after=request.GET.get("after"), before=request.GET.get("before")
+        )
+        # Страница выбирается из базы целиком до ответа: открытый курсор
+        # SQLite держал бы блокировку, пока медленный клиент читает ответ.
+        # Потоком идёт только кодирование.
+        tail = b"".join(
+            (
+                b'],"next":',
+                dumps(self.page_url("after", page.next_cursor)),
+                b',"previous":',
+                dumps(self.page_url("before", page.previous_cursor)),
+                b"}",
+            )
+        )
+        return StreamingHttpResponse(
+            self.get_encoder(names, columns).stream(
+                page, head=b'{"results":[', tail=tail
+            ),
+            content_type="application/json",
+        )
+
+    def page_url(self, direction, cursor):
+        if cursor is None:
+            return None
+        query = self.request.GET.copy()
+        query.pop("after", None)
+        query.pop("before", None)
+        query[direction] = cursor
+        return self.request.build_absolute_uri(
+            f"{self.request.path}?{query.urlencode()}"
+        )
+
+
+class PostApiMixin:
+    fields = POST_FIELDS
+    annotations = POST_ANNOTATIONS
+    converters = {"image": image_url}
+    ordering = ("-pub_date", "id")
+
+
+class PostListApiView(PostApiMixin, ApiListView):
+    def get_queryset(self):
+        return get_posts(Post.objects)
+
+
+class CategoryPostListApiView(PostApiMixin, ApiListView):
+    def get_queryset(self):
+        category = get_object_or_404(
+            Category, slug=self.kwargs["category_slug"], is_published=True
+        )
+        return get_posts(Post.objects.filter(category=category))
+
+
+class PostDetailApiView(PostApiMixin, ApiView):
+    def get(self, request, post_id):
+        names = self.get_field_names()
+        columns = self.get_columns(names)
+        posts = get_posts(Post.objects).filter(pk=post_id)
+        row = self.get_rows(posts, columns).first()
+        if row is None:
+            raise Http404
+        (item,) = self.get_encoder(names, columns).objects([row])
+        return HttpResponse(dumps(item), content_type="application/json")
+
+
+class CommentListApiView(ApiListView):
+    fields = COMMENT_FIELDS
+    ordering = ("created_at", "id")
+
+    def get_queryset(self):
+        post = get_object_or_404(
+            get_posts(Post.objects), pk=self.kwargs["post_id"]
+        )
+        return post.comments.all()
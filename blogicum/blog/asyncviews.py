@@ -0,0 +1,53 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from asgiref.sync import SyncToAsync
+from django.conf import settings
+from django.db import close_old_connections
+
+
+@lru_cache(maxsize=None)
+def view_executor():
+    # Один ограниченный пул на процесс: сколько бы медленных клиентов ни
+    # держал воркер ASGI, с базой одновременно работают не больше стольких
+    # потоков, а ждущие соединения потоков не занимают.
+    return ThreadPoolExecutor(
+        max_workers=settings.BLOG_ASYNC_VIEW_THREADS,
+        thread_name_prefix="blog-view",
+    )
+
+
+def render_view(view, request, *args, **kwargs):
+    # Шаблон рендерится здесь же: ленивые выборки в шаблоне ходят в базу, а
+    # обработчик ASGI отрисовал бы ответ в единственном общем потоке.
+    # Сигналов начала и конца запроса в потоках пула нет, поэтому устаревшие
+    # соединения закрываем сами, как это делает обработчик Django.
+    close_old_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if callable(getattr(response, "render", None)):
+            response = response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def async_view(view_class, **initkwargs):
+    view = view_class.as_view(**initkwargs)
+
+    async def async_view(request, *args, **kwargs):
+        run = SyncToAsync(
+            render_view, thread_sensitive=False, executor=view_executor()
+        )
+        return await run(view, request, *args, **kwargs)
+
+    async_view.view_class = view_class
+    return async_view
+
+
+def page_view(view_class, **initkwargs):
+    # Асинхронные варианты нужны только под ASGI: под WSGI Django запускал бы
+    # для каждого такого запроса отдельный цикл событий.
+    if settings.BLOG_ASYNC_VIEWS:
+        return async_view(view_class, **initkwargs)
+    return view_class.as_view(**initkwargs)
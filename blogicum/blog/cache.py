@@ -0,0 +1,150 @@
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, Max, Min, Sum
+from django.utils import timezone
+
+FRAGMENT_HITS_KEY = "blog:fragment:hits"
+FRAGMENT_MISSES_KEY = "blog:fragment:misses"
+
+
+def get_version(name):
+    # Версии входят в ключи кэша: после изменения данных версия меняется,
+    # и устаревшие записи просто перестают читаться.
+    return cache.get_or_set(f"blog:version:{name}", time.time_ns, None)
+
+
+def bump_version(name):
+    cache.set(f"blog:version:{name}", time.time_ns(), None)
+
+
+def content_version():
+    # Меняется при любой правке публикаций, комментариев и справочников.
+    return get_version("content")
+
+
+def bump_content_version():
+    bump_version("content")
+
+
+def card_version():
+    # Меняется при правке категорий и местоположений, которые выводятся в
+    # карточке публикации; изменения самой публикации учитывает updated_at.
+    return get_version("card")
+
+
+def bump_card_version():
+    bump_version("card")
+
+
+def post_card_key(post):
+    return (
+        f"blog:post-card:{card_version()}:{post.pk}:"
+        f"{post.updated_at.timestamp()}:{post.comment_count}"
+    )
+
+
+def count_fragment_hit(hit):
+    key = FRAGMENT_HITS_KEY if hit else FRAGMENT_MISSES_KEY
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def fragment_stats():
+    hits = cache.get(FRAGMENT_HITS_KEY, 0)
+    misses = cache.get(FRAGMENT_MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / total if total else 0.0,
+    }
+
+
+def reset_fragment_stats():
+    cache.delete_many([FRAGMENT_HITS_KEY, FRAGMENT_MISSES_KEY])
+
+
+def username_key(user_id):
+    return f"blog:username:{user_id}"
+
+
+def get_username(user_id):
+    # Имя пользователя по id без загрузки всей строки пользователя: нужно
+    # для ссылок на профиль, когда автор объекта ещё не загружен. Срок
+    # конечный: при локальном кэше переименование обновляет запись только
+    # в процессе, сохранившем пользователя.
+    key = username_key(user_id)
+    username = cache.get(key)
+    if username is None:
+        username = (
+            get_user_model()
+            .objects.values_list("username", flat=True)
+            .get(pk=user_id)
+        )
+        cache.set(key, username, settings.BLOG_USERNAME_CACHE_TIMEOUT)
+    return username
+
+
+def remember_username(user):
+    cache.set(
+        username_key(user.pk),
+        user.username,
+        settings.BLOG_USERNAME_CACHE_TIMEOUT,
+    )
+
+
+def next_publication(scheduled):
+    return scheduled.aggregate(next=Min("pub_date"))["next"]
+
+
+def timeout_until(moment, default):
+    if moment is None:
+        return default
+    seconds = math.ceil((moment - timezone.now()).total_seconds())
+    return max(1, min(default, seconds))
+
+
+def page_cache_key(request):
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f"blog:page:{content_version()}:{path}"
+
+
+def page_validators(posts, comments=False, extra=()):
+    # ETag и Last-Modified для условного GET по одному агрегату: ответ 304
+    # обходится без основных запросов и шаблона. Число публикаций и сумма
+    # comment_count в ETag замечают удаления и новые комментарии, которых не
+    # видно по датам; правки комментариев дат не оставляют, их учитывают
+    # через extra. Даты комментариев (comments=True) соединяют публикации с
+    # таблицей комментариев, поэтому нужны только для одной публикации.
+    aggregates = {
+        "latest": Max("pub_date"),
+        "updated": Max("updated_at"),
+        "posts": Count("pk", distinct=comments),
+        "total_comments": Sum("comment_count"),
+    }
+    if comments:
+        aggregates["total_comments"] = Count("comments")
+        aggregates["last_comment"] = Max("comments__created_at")
+    stats = posts.order_by().aggregate(**aggregates)
+    if not stats["posts"]:
+        return None, None
+    values = (*extra, *stats.values())
+    etag = hashlib.md5(":".join(map(str, values)).encode()).hexdigest()
+    last_modified = max(
+        moment
+        for moment in (
+            stats["latest"],
+            stats["updated"],
+            stats.get("last_comment"),
+        )
+        if moment is not None
+    )
+    return etag, last_modified
@@ -0,0 +1,126 @@
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.text import Truncator
+from django.views.decorators.http import condition
+
+from .cache import page_validators
+from .models import Category, Post
+from .views import get_feed, get_posts
+
+FEED_SIZE = 20
+DESCRIPTION_WORDS = 50
+
+
+class PostFeed(Feed):
+    title = "Блогикум — новые публикации"
+
+    def __call__(self, request, *args, **kwargs):
+        # Агрегат по тем же публикациям, что попадут в ленту: пока он не
+        # изменился, клиенту отвечаем 304, не строя ленту.
+        obj = self.get_object(request, *args, **kwargs)
+        etag, last_modified = page_validators(self.published(obj))
+
+        @condition(
+            etag_func=lambda request: etag,
+            last_modified_func=lambda request: last_modified,
+        )
+        def render(request):
+            # Заголовки ETag и Last-Modified к ответу добавит condition().
+            feed = self.get_feed(obj, request)
+            response = HttpResponse(content_type=feed.content_type)
+            feed.write(response, "utf-8")
+            return response
+
+        return render(request)
+
+    def description(self, obj):
+        return "Последние публикации всех авторов."
+
+    def link(self, obj):
+        return reverse("blog:index")
+
+    def published(self, obj):
+        return get_posts(Post.objects)
+
+    def items(self, obj):
+        return get_feed(self.published(obj))[:FEED_SIZE]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return Truncator(item.text_preview).words(DESCRIPTION_WORDS)
+
+    def item_link(self, item):
+        return reverse("blog:post_detail", args=(item.pk,))
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.author.get_username()
+
+    def item_categories(self, item):
+        return (item.category.title,)
+
+
+class CategoryPostFeed(PostFeed):
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True
+        )
+
+    def title(self, obj):
+        return f"Блогикум — {obj.title}"
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse("blog:category_posts", args=(obj.slug,))
+
+    def published(self, obj):
+        return get_posts(Post.objects.filter(category=obj))
+
+
+class AuthorPostFeed(PostFeed):
+    def get_object(self, request, username):
+        return get_object_or_404(get_user_model(), username=username)
+
+    def title(self, obj):
+        return f"Блогикум — публикации {obj.get_username()}"
+
+    def description(self, obj):
+        return f"Последние публикации автора {obj.get_username()}."
+
+    def link(self, obj):
+        return reverse("users:profile", args=(obj.get_username(),))
+
+    def published(self, obj):
+        return get_posts(Post.objects.filter(author=obj))
+
+
+class AtomFeedMixin:
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class AtomPostFeed(AtomFeedMixin, PostFeed):
+    pass
+
+
+class AtomCategoryPostFeed(AtomFeedMixin, CategoryPostFeed):
+    pass
+
+
+class AtomAuthorPostFeed(AtomFeedMixin, AuthorPostFeed):
+    pass
@@ -1,5 +1,13 @@
+from functools import partial
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
 from django import forms
+from django.db import transaction
+from .images import strip_metadata
+from .jobs import enqueue
 from .models import Post, Comment
 
 User = get_user_model()
@@ -35,10 +43,44 @@ class PostForm(forms.ModelForm):
             "location": forms.Select(attrs={"class": "form-control"}),
         }
 
+    def __init__(self, *args, upload_error=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.upload_error = upload_error
+
+    def clean_image(self):
+        if self.upload_error:
+            raise ValidationError(self.upload_error)
+        image = self.cleaned_data.get("image")
+        if not isinstance(image, UploadedFile):
+            return image
+        # ImageField уже прочитал заголовок: размеры известны до того, как
+        # Pillow начнёт распаковывать пиксели.
+        width, height = image.image.size
+        if width * height > settings.BLOG_IMAGE_MAX_PIXELS:
+            megapixels = settings.BLOG_IMAGE_MAX_PIXELS // 1_000_000
+            raise ValidationError(
+                f"Фото слишком большое: {width}×{height} пикселей, "
+                f"можно не больше {megapixels} мегапикселей."
+            )
+        return strip_metadata(image)
+
     def clean_pub_date(self):
         pub_date = self.cleaned_data.get("pub_date")
         return pub_date
 
+    def save(self, commit=True):
+        image_changed = "image" in self.changed_data
+        if image_changed:
+            # Копии старого фото больше не подходят: пока воркер не создаст
+            # новые, шаблоны выводят оригинал.
+            self.instance.image_renditions = {}
+        post = super().save(commit)
+        if commit and image_changed:
+            transaction.on_commit(
+                partial(enqueue, "render_post_image", post_id=post.pk)
+            )
+        return post
+
 
 class CommentForm(forms.ModelForm):
     class Meta:
@@ -0,0 +1,181 @@
+import posixpath
+from datetime import timedelta
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .jobs import enqueue
+from .models import Post
+
+# Ширина уменьшенных копий по возрастанию: карточка и страница публикации
+# выводятся в блоке шириной 40rem, full — для экранов высокой плотности.
+RENDITIONS = {
+    "card": 640,
+    "detail": 960,
+    "full": 1600,
+}
+RENDITION_FORMATS = {
+    "jpg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+    "webp": ("WEBP", {"quality": 80, "method": 6}),
+}
+RENDITIONS_DIR = "renditions"
+# Параметры пересохранения загруженного оригинала.
+UPLOAD_FORMATS = {
+    "JPEG": {"quality": 90, "optimize": True},
+    "WEBP": {"quality": 90},
+}
+
+
+def rendition_name(name, rendition, extension):
+    directory, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(
+        directory, RENDITIONS_DIR, f"{stem}_{rendition}.{extension}"
+    )
+
+
+def rendition_names(name, renditions):
+    return [
+        rendition_name(name, rendition, extension)
+        for rendition in renditions
+        for extension in RENDITION_FORMATS
+    ]
+
+
+def rendition_url(post, rendition, extension, storage=default_storage):
+    return storage.url(rendition_name(post.image.name, rendition, extension))
+
+
+def _has_alpha(image):
+    return image.mode in ("RGBA", "LA") or (
+        image.mode == "P" and "transparency" in image.info
+    )
+
+
+def _for_format(image, image_format):
+    if not _has_alpha(image):
+        return image.convert("RGB")
+    image = image.convert("RGBA")
+    if image_format != "JPEG":
+        return image
+    # JPEG не хранит прозрачность: подкладываем белый фон.
+    background = Image.new("RGB", image.size, "white")
+    background.paste(image, mask=image.getchannel("A"))
+    return background
+
+
+def _save(storage, name, image, image_format, options):
+    buffer = BytesIO()
+    image.save(buffer, image_format, **options)
+    if storage.exists(name):
+        storage.delete(name)
+    storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def strip_metadata(upload):
+    # Пересохраняет загруженное фото без EXIF (в нём бывают координаты
+    # съёмки и модель телефона), повернув его по тегу ориентации. Файл
+    # перезаписывается на месте, второй временной копии не появляется.
+    upload.seek(0)
+    with Image.open(upload) as original:
+        if getattr(original, "is_animated", False):
+            upload.seek(0)
+            return upload
+        image_format = original.format
+        icc_profile = original.info.get("icc_profile")
+        image = ImageOps.exif_transpose(original)
+        image.load()
+    upload.seek(0)
+    upload.truncate()
+    image.save(
+        upload,
+        image_format,
+        exif=b"",
+        icc_profile=icc_profile,
+        **UPLOAD_FORMATS.get(image_format, {}),
+    )
+    upload.size = upload.tell()
+    upload.seek(0)
+    return upload
+
+
+def render_image(name, storage=default_storage):
+    # Возвращает {размер: фактическая ширина}. Копии шире оригинала не
+    # создаются, поэтому для маленьких картинок размеров меньше трёх.
+    renditions = {}
+    with storage.open(name) as source, Image.open(source) as original:
+        original = ImageOps.exif_transpose(original)
+        for rendition, width in RENDITIONS.items():
+            if renditions and original.width <= max(renditions.values()):
+                break
+            resized = original.copy()
+            if resized.width > width:
+                resized.thumbnail(
+                    (width, resized.height), Image.Resampling.LANCZOS
+                )
+            for extension, format_options in RENDITION_FORMATS.items():
+                image_format, options = format_options
+                _save(
+                    storage,
+                    rendition_name(name, rendition, extension),
+                    _for_format(resized, image_format),
+                    image_format,
+                    options,
+                )
+            renditions[rendition] = resized.width
+    return renditions
+
+
+def delete_renditions(name, renditions, storage=default_storage):
+    for rendition in rendition_names(name, renditions):
+        if storage.exists(rendition):
+            storage.delete(rendition)
+
+
+def schedule_release(name):
+    # Освобождение откладывается: такое же фото могли только что загрузить,
+    # и save() вернул имя этого файла, а публикация со ссылкой на него ещё
+    # не сохранена. За BLOG_IMAGE_RELEASE_DELAY она успеет это сделать.
+    delay = timedelta(seconds=settings.BLOG_IMAGE_RELEASE_DELAY)
+    enqueue("release_image", run_after=timezone.now() + delay, name=name)
+
+
+def release_image(name):
+    # Число ссылок на файл из хранилища с адресацией по содержимому —
+    # число публикаций с таким image; последняя ссылка удаляет и копии.
+    # Файл, тронутый за время отсрочки, снова загрузили: его оставляем
+    # gc_media на случай, если ссылка так и не появится.
+    if not name or Post.objects.filter(image=name).exists():
+        return False
+    storage = Post._meta.get_field("image").storage
+    try:
+        modified = storage.get_modified_time(name)
+    except FileNotFoundError:
+        return False
+    delay = timedelta(seconds=settings.BLOG_IMAGE_RELEASE_DELAY)
+    if modified > timezone.now() - delay:
+        return False
+    storage.delete(name)
+    delete_renditions(name, RENDITIONS, storage)
+    return True
+
+
+def render_post_image(post):
+    renditions = render_image(post.image.name) if post.image else {}
+    post.image_renditions = renditions
+    # updated_at входит в ключ кэша карточки — иначе она осталась бы
+    # без srcset.
+    Post.objects.filter(pk=post.pk).update(
+        image_renditions=renditions, updated_at=timezone.now()
+    )
+    return renditions
+
+
+def render_post_image_job(post_id):
+    post = Post.objects.filter(pk=post_id).only("pk", "image").first()
+    if post is not None:
+        render_post_image(post)
@@ -0,0 +1,93 @@
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+# Тип задачи -> функция, которая её выполняет. Функции импортируются уже в
+# процессе воркера, поэтому веб-процессу не нужно загружать Pillow и т. п.
+HANDLERS = {
+    "render_post_image": "blog.images.render_post_image_job",
+    "release_image": "blog.images.release_image",
+}
+
+
+def enqueue(kind, run_after=None, **payload):
+    if kind not in HANDLERS:
+        raise ValueError(f"Неизвестный тип задачи: {kind}")
+    if run_after is not None:
+        return Job.objects.create(
+            kind=kind, payload=payload, run_after=run_after
+        )
+    # Запись создаётся сразу. Внутри транзакции ставьте задачу через
+    # transaction.on_commit: иначе воркер может взять её раньше, чем
+    # сохранятся изменения, ради которых она поставлена.
+    return Job.objects.create(kind=kind, payload=payload)
+
+
+def retry_delay(attempts):
+    return timedelta(
+        seconds=settings.BLOG_JOB_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def release_stale():
+    # Задачи воркера, который упал посреди работы, возвращаются в очередь.
+    deadline = timezone.now() - timedelta(seconds=settings.BLOG_JOB_TIMEOUT)
+    stale = Job.objects.filter(status=Job.RUNNING, started_at__lt=deadline)
+    return stale.update(status=Job.PENDING, updated_at=timezone.now())
+
+
+def claim(limit):
+    if limit <= 0:
+        return []
+    now = timezone.now()
+    candidates = list(
+        Job.objects.filter(status=Job.PENDING, run_after__lte=now)
+        .order_by("run_after", "pk")
+        .values_list("pk", flat=True)[:limit]
+    )
+    claimed = []
+    for pk in candidates:
+        # Условный UPDATE вместо SELECT ... FOR UPDATE SKIP LOCKED, которого
+        # нет в SQLite: задачу получает тот, чей запрос изменил строку.
+        updated = Job.objects.filter(pk=pk, status=Job.PENDING).update(
+            status=Job.RUNNING,
+            attempts=F("attempts") + 1,
+            started_at=now,
+            updated_at=now,
+        )
+        if updated:
+            claimed.append(pk)
+    return claimed
+
+
+def run_job(pk):
+    job = Job.objects.get(pk=pk)
+    try:
+        import_string(HANDLERS[job.kind])(**job.payload)
+    except Exception:
+        fail_job(job, traceback.format_exc())
+        return False
+    Job.objects.filter(pk=pk).update(
+        status=Job.DONE, last_error="", updated_at=timezone.now()
+    )
+    return True
+
+
+def fail_job(job, error):
+    now = timezone.now()
+    if job.attempts >= settings.BLOG_JOB_MAX_ATTEMPTS:
+        changes = {"status": Job.FAILED}
+    else:
+        changes = {
+            "status": Job.PENDING,
+            "run_after": now + retry_delay(job.attempts),
+        }
+    Job.objects.filter(pk=job.pk).update(
+        last_error=error, updated_at=now, **changes
+    )
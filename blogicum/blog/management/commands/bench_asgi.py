@@ -0,0 +1,199 @@
+import asyncio
+import importlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.urls import clear_url_caches, resolve
+from django.utils.module_loading import import_string
+
+# Адрес из TEST-NET: не попадает в INTERNAL_IPS, и debug toolbar не
+# встраивается в ответы.
+CLIENT_ADDRESS = "192.0.2.1"
+
+
+def reload_urlconf():
+    # Синхронные или асинхронные страницы выбираются при импорте URLconf,
+    # поэтому для каждого режима модули перечитываются.
+    for name in ("blog.urls", "users.urls", settings.ROOT_URLCONF):
+        importlib.reload(importlib.import_module(name))
+    clear_url_caches()
+
+
+class Command(BaseCommand):
+    help = (
+        "Нагрузочный тест: одни и те же страницы через обработчики WSGI и "
+        "ASGI в этом процессе, с медленными клиентами. Работает с текущей "
+        "базой данных."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help=(
+                "Адрес страницы; можно указать несколько раз. "
+                "По умолчанию /."
+            ),
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Сколько запросов сделать.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=100,
+            help="Сколько соединений клиенты держат одновременно.",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=8,
+            help="Потоков у сервера WSGI и в пуле асинхронных страниц.",
+        )
+        parser.add_argument(
+            "--client-delay",
+            type=float,
+            default=0.05,
+            help="Сколько секунд клиент читает ответ.",
+        )
+        parser.add_argument(
+            "--page-cache",
+            action="store_true",
+            help=(
+                "Не отключать кэш страниц; "
+                "по умолчанию замеряется их работа."
+            ),
+        )
+
+    def handle(self, *args, paths, requests, concurrency, threads, **options):
+        paths = paths or ["/"]
+        urls = [paths[index % len(paths)] for index in range(requests)]
+        self.client_delay = options["client_delay"]
+        # Нулевой срок: ответы гостям не кэшируются, а счётчики и фрагменты
+        # работают как обычно.
+        page_timeout = (
+            settings.BLOG_PAGE_CACHE_TIMEOUT if options["page_cache"] else 0
+        )
+
+        sync_only = [
+            name
+            for name in settings.MIDDLEWARE
+            if not getattr(import_string(name), "async_capable", False)
+        ]
+        if sync_only:
+            self.stdout.write(
+                self.style.WARNING(
+                    "Только синхронное middleware: "
+                    f"{', '.join(sync_only)}. Под ASGI вся цепочка и страницы "
+                    "выполняются в потоках."
+                )
+            )
+
+        results = {}
+        for mode, async_views in (("WSGI", False), ("ASGI", True)):
+            with override_settings(
+                BLOG_ASYNC_VIEWS=async_views,
+                BLOG_ASYNC_VIEW_THREADS=threads,
+                BLOG_PAGE_CACHE_TIMEOUT=page_timeout,
+            ):
+                reload_urlconf()
+                if async_views and not asyncio.iscoroutinefunction(
+                    resolve(paths[0]).func
+                ):
+                    self.stdout.write(
+                        self.style.WARNING(f"{paths[0]}: синхронная страница.")
+                    )
+                started = time.perf_counter()
+                if async_views:
+                    statuses = asyncio.run(self.run_asgi(urls, concurrency))
+                else:
+                    statuses = self.run_wsgi(urls, threads)
+                elapsed = time.perf_counter() - started
+            failed = sum(status != 200 for status in statuses)
+            results[mode] = requests / elapsed
+            self.stdout.write(
+                f"{mode}: {requests} запросов за {elapsed:.2f} с, "
+                f"{results[mode]:.1f} в секунду, ошибок {failed}."
+            )
+        reload_urlconf()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"ASGI / WSGI: {results['ASGI'] / results['WSGI']:.2f}× "
+                f"при {concurrency} соединениях и {threads} потоках."
+            )
+        )
+
+    def run_wsgi(self, urls, threads):
+        handler = WSGIHandler()
+
+        def request(path):
+            environ = {"PATH_INFO": path, "REMOTE_ADDR": CLIENT_ADDRESS}
+            setup_testing_defaults(environ)
+            statuses = []
+
+            def start_response(status, headers, exc_info=None):
+                statuses.append(status)
+
+            body = handler(environ, start_response)
+            try:
+                for _ in body:
+                    # Поток сервера занят, пока клиент не дочитает ответ.
+                    time.sleep(self.client_delay)
+            finally:
+                body.close()
+            return int(statuses[0].split()[0])
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            return list(pool.map(request, urls))
+
+    async def run_asgi(self, urls, concurrency):
+        handler = ASGIHandler()
+        connections = asyncio.Semaphore(concurrency)
+
+        async def request(path):
+            status = None
+
+            async def receive():
+                return {
+                    "type": "http.request",
+                    "body": b"",
+                    "more_body": False,
+                }
+
+            async def send(message):
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                elif not message.get("more_body"):
+                    # Медленный клиент держит только соединение, не поток.
+                    await asyncio.sleep(self.client_delay)
+
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": path,
+                "raw_path": path.encode(),
+                "query_string": b"",
+                "root_path": "",
+                "headers": [(b"host", b"127.0.0.1")],
+                "client": (CLIENT_ADDRESS, 0),
+                "server": ("127.0.0.1", 80),
+            }
+            async with connections:
+                await handler(scope, receive, send)
+            return status
+
+        return await asyncio.gather(*(request(path) for path in urls))
@@ -0,0 +1,139 @@
+import json
+import statistics
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core import serializers
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.forms.models import model_to_dict
+from django.utils import timezone
+
+from blog.api.encoders import RowEncoder, orjson
+from blog.api.views import POST_ANNOTATIONS, POST_FIELDS, image_url
+from blog.models import Category, Post
+
+MODEL_FIELDS = (
+    "title",
+    "text",
+    "pub_date",
+    "updated_at",
+    "author",
+    "category",
+    "location",
+    "image",
+    "comment_count",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает сериализацию публикаций в JSON: стандартный сериализатор "
+        "Django, model_to_dict, values() и потоковый кодировщик API. "
+        "Корпус создаётся в транзакции и откатывается."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--posts", type=int, default=10_000, help="Размер корпуса."
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Сколько раз повторить замер.",
+        )
+
+    def handle(self, *args, posts, repeat, **options):
+        with transaction.atomic():
+            self.generate(posts)
+            self.stdout.write(
+                f"Кодировщик API: {'orjson' if orjson else 'json из stdlib'}."
+            )
+            for label, method in (
+                ("serializers.serialize", self.django_serializer),
+                ("model_to_dict", self.model_to_dict),
+                ("values() + JsonResponse", self.values),
+                ("values_list() + RowEncoder", self.row_encoder),
+            ):
+                self.report(label, method, repeat)
+            transaction.set_rollback(True)
+
+    def generate(self, count):
+        author = get_user_model().objects.create(username="bench-json")
+        category = Category.objects.create(
+            title="Замер", description="Замер", slug="bench-json"
+        )
+        now = timezone.now()
+        Post.objects.bulk_create(
+            (
+                Post(
+                    title=f"Публикация номер {index}",
+                    text="Текст публикации для замера сериализации. " * 20,
+                    pub_date=now,
+                    author=author,
+                    category=category,
+                )
+                for index in range(count)
+            ),
+            batch_size=1000,
+        )
+
+    @staticmethod
+    def posts():
+        return Post.objects.filter(category__slug="bench-json").order_by("id")
+
+    def django_serializer(self):
+        return serializers.serialize(
+            "json", self.posts(), fields=MODEL_FIELDS
+        ).encode()
+
+    def model_to_dict(self):
+        items = [
+            model_to_dict(post, fields=MODEL_FIELDS) for post in self.posts()
+        ]
+        for item in items:
+            item["image"] = image_url(item["image"].name)
+        return json.dumps(items, cls=DjangoJSONEncoder).encode()
+
+    def values(self):
+        # Путь API до потокового кодировщика: словари values() в JsonResponse.
+        rows = (
+            self.posts()
+            .annotate(**POST_ANNOTATIONS)
+            .values(*POST_FIELDS.values())
+        )
+        items = []
+        for row in rows:
+            item = {name: row[lookup] for name, lookup in POST_FIELDS.items()}
+            item["image"] = image_url(item["image"])
+            items.append(item)
+        return json.dumps(items, cls=DjangoJSONEncoder).encode()
+
+    def row_encoder(self):
+        columns = list(POST_FIELDS.values())
+        rows = list(
+            self.posts().annotate(**POST_ANNOTATIONS).values_list(*columns)
+        )
+        encoder = RowEncoder(
+            list(POST_FIELDS), range(len(columns)), {"image": image_url}
+        )
+        return b"".join(encoder.stream(rows))
+
+    def report(self, label, method, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            size = len(method())
+            timings.append(time.perf_counter() - started)
+        # Пик памяти — отдельным прогоном: tracemalloc сам замедляет код.
+        tracemalloc.start()
+        method()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.stdout.write(
+            f"{label}: медиана {statistics.median(timings) * 1000:.0f} мс, "
+            f"пик памяти {peak / 2**20:.1f} МБ, ответ {size / 2**20:.1f} МБ."
+        )
@@ -0,0 +1,150 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from blog.models import Category, Post
+from blog.search import reindex_posts, search_posts
+from blog.views import get_posts
+
+# Словоформы корпуса — основа из слогов плюс падежное окончание, так что
+# в текстах и запросах встречаются разные формы одних и тех же слов.
+CONSONANTS = "бвгдзклмнпрст"
+VOWELS = "аоуыеи"
+ENDINGS = "а и у ой е ами ах ам".split()
+FILLER = (
+    "и в на с по это было очень когда потом "
+    "сегодня вчера снова рядом далеко быстро тихо"
+).split()
+
+
+def make_stems(rng, count):
+    return [
+        "".join(rng.choice(CONSONANTS) + rng.choice(VOWELS) for _ in range(3))
+        + rng.choice(CONSONANTS)
+        for _ in range(count)
+    ]
+
+
+def word(rng, stems):
+    if rng.random() < 0.3:
+        # Частота основ убывает примерно как у слов живого языка.
+        stem = stems[min(int(rng.paretovariate(1)) - 1, len(stems) - 1)]
+        return stem + rng.choice(ENDINGS)
+    return rng.choice(FILLER)
+
+
+def percentile(values, share):
+    return sorted(values)[min(len(values) - 1, int(len(values) * share))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Замеряет скорость поиска на сгенерированных публикациях. "
+        "Корпус создаётся в транзакции и откатывается."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--posts", type=int, default=20_000, help="Размер корпуса."
+        )
+        parser.add_argument(
+            "--queries",
+            type=int,
+            default=200,
+            help="Сколько запросов выполнить.",
+        )
+        parser.add_argument(
+            "--vocabulary",
+            type=int,
+            default=5000,
+            help="Сколько разных основ.",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=1, help="Зерно генератора."
+        )
+
+    def handle(self, *args, posts, queries, vocabulary, seed, **options):
+        rng = random.Random(seed)
+        stems = make_stems(rng, vocabulary)
+        with transaction.atomic():
+            self.generate(rng, stems, posts)
+            words = [
+                rng.choice(stems) + rng.choice(ENDINGS)
+                for _ in range(queries)
+            ]
+            self.report("FTS5 с основами", self.measure(words, self.search))
+            self.report("icontains по тексту", self.measure(words, self.scan))
+            transaction.set_rollback(True)
+
+    def generate(self, rng, vocabulary, count):
+        author = get_user_model().objects.create(username="bench-search")
+        category = Category.objects.create(
+            title="Замер", description="Замер", slug="bench-search"
+        )
+        now = timezone.now()
+        started = time.perf_counter()
+        batch_size = 1000
+        for offset in range(0, count, batch_size):
+            Post.objects.bulk_create(
+                Post(
+                    title=" ".join(word(rng, vocabulary) for _ in range(5)),
+                    text=" ".join(
+                        word(rng, vocabulary)
+                        for _ in range(rng.randint(50, 300))
+                    ),
+                    pub_date=now,
+                    author=author,
+                    category=category,
+                )
+                for _ in range(min(batch_size, count - offset))
+            )
+        inserted = time.perf_counter()
+
+        # bulk_create не шлёт сигналов, поэтому индекс заполняем сами.
+        reindex_posts(Post.objects.filter(author=author), batch_size)
+        indexed = time.perf_counter()
+        self.stdout.write(
+            f"Корпус: {count} публикаций, вставка {inserted - started:.2f} с, "
+            f"индексация {indexed - inserted:.2f} с "
+            f"({count / (indexed - inserted):.0f} публикаций в секунду)."
+        )
+
+    @staticmethod
+    def search(query):
+        return search_posts(get_posts(Post.objects), query).order_by(
+            "rank", "id"
+        )
+
+    @staticmethod
+    def scan(query):
+        return (
+            get_posts(Post.objects)
+            .filter(Q(title__icontains=query) | Q(text__icontains=query))
+            .order_by("-pub_date")
+        )
+
+    @staticmethod
+    def measure(words, build):
+        timings = []
+        hits = 0
+        for query in words:
+            started = time.perf_counter()
+            page = list(build(query).only("id")[:10])
+            timings.append(time.perf_counter() - started)
+            hits += len(page)
+        return timings, hits / len(words)
+
+    def report(self, label, result):
+        timings, hits = result
+        self.stdout.write(
+            f"{label}: медиана {statistics.median(timings) * 1000:.2f} мс, "
+            f"p95 {percentile(timings, 0.95) * 1000:.2f} мс, "
+            f"максимум {max(timings) * 1000:.2f} мс, "
+            f"в среднем {hits:.1f} результатов на первой странице."
+        )
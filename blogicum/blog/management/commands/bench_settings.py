@@ -0,0 +1,165 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.urls import get_resolver
+
+PROFILES = ("development", "production")
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает профили настроек development и production: время запуска "
+        "процесса и время обработки запроса. Каждый профиль запускается в "
+        "отдельном процессе на текущей базе данных."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help=(
+                "Адрес страницы; можно указать несколько раз. "
+                "По умолчанию /."
+            ),
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Сколько запросов сделать в каждом процессе.",
+        )
+        parser.add_argument(
+            "--runs", type=int, default=3, help="Сколько процессов на профиль."
+        )
+        parser.add_argument(
+            "--page-cache",
+            action="store_true",
+            help=(
+                "Не отключать кэш страниц; "
+                "по умолчанию замеряется их работа."
+            ),
+        )
+        parser.add_argument(
+            "--child", action="store_true", help=argparse.SUPPRESS
+        )
+
+    def handle(
+        self, *args, paths, requests, runs, child, page_cache, **options
+    ):
+        paths = paths or ["/"]
+        if child:
+            self.measure(paths, requests, page_cache)
+            return
+        results = {
+            profile: self.run(profile, paths, requests, runs, page_cache)
+            for profile in PROFILES
+        }
+        for profile, result in results.items():
+            self.stdout.write(
+                f"{profile}: запуск {result['startup']:.0f} мс, "
+                f"первый запрос {result['first']:.1f} мс, "
+                f"медиана {result['median']:.2f} мс, "
+                f"95-й перцентиль {result['p95']:.2f} мс."
+            )
+        development, production = (results[profile] for profile in PROFILES)
+        self.stdout.write(
+            self.style.SUCCESS(
+                "production / development: запрос "
+                f"{production['median'] / development['median']:.2f}×, запуск "
+                f"{production['startup'] / development['startup']:.2f}×."
+            )
+        )
+
+    def run(self, profile, paths, requests, runs, page_cache):
+        environ = {
+            **os.environ,
+            "BLOGICUM_ENV": profile,
+            "DJANGO_SETTINGS_MODULE": "blogicum.settings",
+        }
+        environ.setdefault("DJANGO_SECRET_KEY", "bench-settings")
+        argv = [sys.argv[0], "bench_settings", "--child"]
+        argv.append(f"--requests={requests}")
+        argv += [f"--path={path}" for path in paths]
+        if page_cache:
+            argv.append("--page-cache")
+        measurements = []
+        for _ in range(runs):
+            started = time.time()
+            output = subprocess.run(
+                [sys.executable, *argv],
+                env=environ,
+                cwd=settings.BASE_DIR,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            measurement = json.loads(output.splitlines()[-1])
+            ready = measurement.pop("ready")
+            measurement["startup"] = (ready - started) * 1000
+            measurements.append(measurement)
+        return {
+            key: statistics.median(item[key] for item in measurements)
+            for key in measurements[0]
+        }
+
+    def measure(self, paths, requests, page_cache):
+        # Процесс готов, когда загружены middleware и URLconf: с этого места
+        # сервер начинает принимать запросы.
+        handler = WSGIHandler()
+        get_resolver().url_patterns
+        ready = time.time()
+        # Общему кэшу production нужна таблица; в запуск её создание не входит.
+        call_command("createcachetable")
+        if not page_cache:
+            override_settings(BLOG_PAGE_CACHE_TIMEOUT=0).enable()
+        timings = []
+        for index in range(requests):
+            started = time.perf_counter()
+            path = paths[index % len(paths)]
+            status = self.request(handler, path)
+            timings.append((time.perf_counter() - started) * 1000)
+            if status != 200:
+                raise RuntimeError(f"{path}: ответ {status}.")
+        first, *rest = timings or [0.0]
+        self.stdout.write(
+            json.dumps(
+                {
+                    "ready": ready,
+                    "first": first,
+                    "median": statistics.median(rest or [first]),
+                    "p95": statistics.quantiles(rest, n=20)[-1]
+                    if len(rest) > 1
+                    else first,
+                }
+            )
+        )
+
+    @staticmethod
+    def request(handler, path):
+        # Запрос с адреса из INTERNAL_IPS: в профиле development его, как и
+        # запросы разработчика, обрабатывает debug toolbar.
+        environ = {"PATH_INFO": path, "REMOTE_ADDR": "127.0.0.1"}
+        setup_testing_defaults(environ)
+        statuses = []
+
+        def start_response(status, headers, exc_info=None):
+            statuses.append(status)
+
+        body = handler(environ, start_response)
+        try:
+            b"".join(body)
+        finally:
+            body.close()
+        return int(statuses[0].split()[0])
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.cache import fragment_stats, reset_fragment_stats
+
+
+class Command(BaseCommand):
+    help = "Показывает долю попаданий в кэш карточек публикаций."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Обнулить счётчики после вывода.",
+        )
+
+    def handle(self, *args, reset, **options):
+        if not settings.BLOG_FRAGMENT_CACHE_STATS:
+            self.stdout.write(
+                self.style.WARNING(
+                    "Счётчики выключены: включите BLOG_FRAGMENT_CACHE_STATS."
+                )
+            )
+        stats = fragment_stats()
+        self.stdout.write(
+            f"Карточки публикаций: попаданий {stats['hits']}, "
+            f"промахов {stats['misses']}, "
+            f"доля попаданий {stats['hit_rate']:.1%}"
+        )
+        if reset:
+            reset_fragment_stats()
@@ -0,0 +1,123 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+
+from blog.images import RENDITIONS, rendition_names
+from blog.models import Post
+
+
+def scan(root):
+    # os.scandir отдаёт тип и размер файла без лишнего stat() на каждый файл
+    # каталога; обходим дерево стеком, без рекурсии.
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+
+
+class Command(BaseCommand):
+    help = (
+        "Удаляет из MEDIA_ROOT фото, на которые не ссылается ни одна "
+        "публикация."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Только показать, что было бы удалено.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Сколько файлов перепроверять по базе и удалять за раз.",
+        )
+        parser.add_argument(
+            "--min-age",
+            type=int,
+            default=settings.BLOG_IMAGE_MIN_AGE,
+            help="Не трогать файлы моложе стольких секунд: публикация с ними "
+            "может быть ещё не сохранена.",
+        )
+
+    def handle(self, *args, dry_run, batch_size, min_age, **options):
+        started = time.monotonic()
+        root = settings.MEDIA_ROOT
+        upload_to = Post._meta.get_field("image").upload_to
+        directory = os.path.join(root, upload_to)
+        if not os.path.isdir(directory):
+            self.stdout.write("Каталог с фото публикаций не найден.")
+            return
+
+        referenced = set()
+        images = (
+            Post.objects.exclude(image="")
+            .values_list("image", flat=True)
+            .iterator(chunk_size=batch_size)
+        )
+        for name in images:
+            referenced.add(name)
+            referenced.update(rendition_names(name, RENDITIONS))
+
+        deadline = time.time() - min_age
+        scanned = scanned_bytes = deleted = deleted_bytes = 0
+        batch = {}
+        for entry in scan(directory):
+            stat = entry.stat(follow_symlinks=False)
+            scanned += 1
+            scanned_bytes += stat.st_size
+            name = os.path.relpath(entry.path, root).replace(os.sep, "/")
+            if name in referenced or stat.st_mtime > deadline:
+                continue
+            batch[name] = (entry.path, stat.st_size)
+            if len(batch) >= batch_size:
+                count, size = self.collect(batch, dry_run)
+                deleted += count
+                deleted_bytes += size
+                batch = {}
+        if batch:
+            count, size = self.collect(batch, dry_run)
+            deleted += count
+            deleted_bytes += size
+
+        action = "Можно удалить" if dry_run else "Удалено"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Просмотрено файлов: {scanned} "
+                f"({filesizeformat(scanned_bytes)}). "
+                f"{action}: {deleted} ({filesizeformat(deleted_bytes)}). "
+                f"Время: {time.monotonic() - started:.2f} с."
+            )
+        )
+
+    def collect(self, batch, dry_run):
+        # Пока шёл обход, новая публикация могла сослаться на уже лежащий
+        # файл (одинаковые фото хранятся один раз), поэтому перепроверяем.
+        # Копии таких фото воркер создаст заново.
+        still_used = set(
+            Post.objects.filter(image__in=batch).values_list(
+                "image", flat=True
+            )
+        )
+        count = size = 0
+        for name, (path, file_size) in batch.items():
+            if name in still_used:
+                continue
+            if dry_run:
+                self.stdout.write(name)
+            else:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+            count += 1
+            size += file_size
+        return count, size
@@ -0,0 +1,113 @@
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, time as day_start
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from blog.search import (
+    SEARCH_TABLE,
+    index_available,
+    post_batches,
+    posts_since,
+    reindex_posts,
+    stem_rows,
+    write_index,
+)
+
+
+def parse_since(value):
+    moment = parse_datetime(value)
+    if moment is None:
+        date = parse_date(value)
+        if date is None:
+            raise CommandError(f"Не удалось разобрать дату: {value}")
+        moment = datetime.combine(date, day_start())
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class Command(BaseCommand):
+    help = "Пересобирает поисковый индекс публикаций."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            help="Переиндексировать только публикации, созданные с этой "
+            "даты (ГГГГ-ММ-ДД или ГГГГ-ММ-ДД ЧЧ:ММ); без неё индекс "
+            "строится заново.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Сколько публикаций читать из базы и записывать за раз.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Сколько процессов разбирают тексты на основы слов.",
+        )
+
+    def handle(self, *args, since, batch_size, workers, **options):
+        if not index_available():
+            raise CommandError(
+                "Поисковый индекс поддерживается только в SQLite."
+            )
+        since = parse_since(since) if since else None
+        posts = posts_since(since)
+
+        started = time.perf_counter()
+        # Каждая пачка пишется своей короткой транзакцией: одна большая на
+        # всю пересборку заблокировала бы запись в базу для всего сайта.
+        if since is None:
+            self.clear()
+        if workers <= 1:
+            total = reindex_posts(posts, batch_size)
+        else:
+            total = self.reindex_parallel(posts, batch_size, workers)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Проиндексировано публикаций: {total} за {elapsed:.2f} с "
+                f"({total / elapsed:.0f} в секунду)."
+            )
+        )
+
+    def reindex_parallel(self, posts, batch_size, workers):
+        # Пачки читает и пишет в индекс только этот процесс, а пул лишь
+        # разбирает тексты на основы: у SQLite один писатель, и чтения из
+        # других процессов вперемешку с записью упирались бы в блокировки.
+        batches = post_batches(posts, batch_size)
+        total = 0
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=django.setup,
+        ) as executor:
+            running = set()
+            while True:
+                # Не больше двух пачек на процесс: прочитанные тексты и готовые
+                # основы не должны копиться в памяти быстрее, чем идёт запись.
+                for batch in batches:
+                    running.add(executor.submit(stem_rows, batch))
+                    if len(running) >= workers * 2:
+                        break
+                if not running:
+                    break
+                finished, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    total += write_index(future.result())
+        return total
+
+    @staticmethod
+    def clear():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает и исправляет счётчики комментариев у публикаций."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Сколько публикаций обрабатывать за один проход.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Только показать расхождения, ничего не сохраняя.",
+        )
+
+    def handle(self, *args, batch_size, dry_run, **options):
+        checked = fixed = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                Post.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .only("pk", "comment_count")[:batch_size]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            actual = dict(
+                Comment.objects.filter(post__in=batch)
+                .order_by()
+                .values("post")
+                .annotate(total=Count("pk"))
+                .values_list("post", "total")
+            )
+            stale = []
+            for post in batch:
+                count = actual.get(post.pk, 0)
+                if post.comment_count != count:
+                    post.comment_count = count
+                    stale.append(post)
+            if stale and not dry_run:
+                with transaction.atomic():
+                    Post.objects.bulk_update(stale, ["comment_count"])
+            checked += len(batch)
+            fixed += len(stale)
+
+        verb = "Найдено расхождений" if dry_run else "Исправлено"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Проверено публикаций: {checked}. {verb}: {fixed}."
+            )
+        )
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from blog.images import render_post_image
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = "Создаёт уменьшенные копии и WebP-версии фотографий публикаций."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            dest="render_all",
+            help="Пересоздать копии и у публикаций, где они уже есть.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Сколько публикаций загружать из базы за один запрос.",
+        )
+
+    def handle(self, *args, render_all, batch_size, **options):
+        posts = Post.objects.exclude(image="").only("pk", "image")
+        if not render_all:
+            posts = posts.filter(image_renditions={})
+
+        done = failed = 0
+        for post in posts.order_by("pk").iterator(chunk_size=batch_size):
+            try:
+                render_post_image(post)
+            except (
+                OSError,
+                ValueError,
+                Image.DecompressionBombError,
+            ) as error:
+                failed += 1
+                self.stderr.write(f"Публикация {post.pk}: {error}")
+            else:
+                done += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Обработано фото: {done}. Ошибок: {failed}.")
+        )
@@ -0,0 +1,95 @@
+import multiprocessing
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.jobs import claim, release_stale, run_job
+
+
+class InlineExecutor(Executor):
+    # --workers 0: задачи выполняются в этом же процессе, по одной.
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as error:
+            future.set_exception(error)
+        return future
+
+
+class Command(BaseCommand):
+    help = "Выполняет фоновые задачи из очереди в пуле процессов."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.BLOG_WORKER_PROCESSES,
+            help="Сколько задач выполнять одновременно; 0 — в этом процессе.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Выполнить задачи, готовые к запуску, и завершиться.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Пауза в секундах между проверками пустой очереди.",
+        )
+
+    def handle(self, *args, workers, once, poll_interval, **options):
+        if not workers:
+            self.work(InlineExecutor(), 1, once, poll_interval)
+            return
+        # spawn, а не fork: дочерние процессы не наследуют открытые
+        # соединения с базой и сами настраивают Django.
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=django.setup,
+        ) as executor:
+            self.work(executor, workers, once, poll_interval)
+
+    def work(self, executor, workers, once, poll_interval):
+        running = {}
+        done = failed = 0
+        try:
+            while True:
+                release_stale()
+                for pk in claim(workers - len(running)):
+                    running[executor.submit(run_job, pk)] = pk
+                if not running:
+                    if once:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+                finished, _ = wait(
+                    running, timeout=poll_interval, return_when=FIRST_COMPLETED
+                )
+                for future in finished:
+                    pk = running.pop(future)
+                    if future.exception() is None and future.result():
+                        done += 1
+                    else:
+                        failed += 1
+                        self.stderr.write(
+                            f"Задача {pk} завершилась с ошибкой."
+                        )
+        except KeyboardInterrupt:
+            # Незавершённые задачи вернёт в очередь release_stale().
+            pass
+        self.stdout.write(
+            self.style.SUCCESS(f"Выполнено задач: {done}. Ошибок: {failed}.")
+        )
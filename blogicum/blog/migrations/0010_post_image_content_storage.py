@@ -0,0 +1,24 @@
+# Generated by Django 3.2.16 on 2026-10-18 20:39
+
+import blog.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0009_job"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="post",
+            name="image",
+            field=models.ImageField(
+                blank=True,
+                storage=blog.storage.ContentAddressedStorage(),
+                upload_to="post_images",
+                verbose_name="Фото",
+            ),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 3.2.16 on 2026-10-18 20:42
+
+import blog.models
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE blog_post_search USING fts5("
+        "title, text, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute(
+        "INSERT INTO blog_post_search (rowid, title, text) "
+        "SELECT id, title, text FROM blog_post"
+    )
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS blog_post_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0010_post_image_content_storage"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostSearch",
+            fields=[
+                (
+                    "post",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search_index",
+                        serialize=False,
+                        to="blog.post",
+                    ),
+                ),
+                ("title", models.TextField()),
+                ("text", models.TextField()),
+                (
+                    "document",
+                    blog.models.FullTextField(db_column="blog_post_search"),
+                ),
+            ],
+            options={
+                "db_table": "blog_post_search",
+                "managed": False,
+            },
+        ),
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
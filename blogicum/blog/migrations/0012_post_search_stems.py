@@ -0,0 +1,47 @@
+import re
+
+import snowballstemmer
+from django.db import migrations
+
+WORD_RE = re.compile(r"\w+")
+
+
+def stem_text(stemmer, text):
+    return " ".join(stemmer.stemWords(WORD_RE.findall(text.lower())))
+
+
+def index_stems(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    Post = apps.get_model("blog", "Post")
+    stemmer = snowballstemmer.stemmer("russian")
+    schema_editor.execute("DELETE FROM blog_post_search")
+    posts = Post.objects.values_list("id", "title", "text").order_by("id")
+    with schema_editor.connection.cursor() as cursor:
+        for pk, title, text in posts.iterator(chunk_size=500):
+            cursor.execute(
+                "INSERT INTO blog_post_search (rowid, title, text) "
+                "VALUES (%s, %s, %s)",
+                [pk, stem_text(stemmer, title), stem_text(stemmer, text)],
+            )
+
+
+def index_words(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DELETE FROM blog_post_search")
+    schema_editor.execute(
+        "INSERT INTO blog_post_search (rowid, title, text) "
+        "SELECT id, title, text FROM blog_post"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0011_post_search"),
+    ]
+
+    operations = [
+        migrations.RunPython(index_stems, index_words),
+    ]
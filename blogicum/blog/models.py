@@ -1,10 +1,23 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from django.utils import timezone
+
+from .cache import get_username
+from .storage import ContentAddressedStorage
 
 User = get_user_model()
 
 
+def author_profile_url(obj):
+    field = obj._meta.get_field("author")
+    if field.is_cached(obj):
+        username = obj.author.username
+    else:
+        username = get_username(obj.author_id)
+    return reverse("users:profile", kwargs={"username": username})
+
+
 class Location(models.Model):
     name = models.CharField(max_length=256, verbose_name="Название места")
     is_published = models.BooleanField(
@@ -80,19 +93,86 @@ class Post(models.Model):
         help_text="Снимите галочку, чтобы скрыть публикацию.",
     )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Добавлено")
-    image = models.ImageField("Фото", upload_to="post_images", blank=True)
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Изменено")
+    image = models.ImageField(
+        "Фото",
+        upload_to="post_images",
+        storage=ContentAddressedStorage(),
+        blank=True,
+    )
+    image_renditions = models.JSONField(
+        "Размеры уменьшенных копий фото",
+        default=dict,
+        blank=True,
+        editable=False,
+    )
+    comment_count = models.PositiveIntegerField(
+        "Количество комментариев", default=0, editable=False
+    )
 
     class Meta:
         verbose_name = "публикация"
         verbose_name_plural = "Публикации"
+        indexes = (
+            models.Index(
+                fields=("-pub_date",),
+                name="post_published_feed_idx",
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=("category", "-pub_date"),
+                name="post_category_feed_idx",
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=("author", "-pub_date"),
+                name="post_author_feed_idx",
+            ),
+        )
 
     def get_absolute_url(self):
-        return reverse("users:profile", kwargs={"username": self.author.username})
+        return author_profile_url(self)
 
     def __str__(self):
         return self.title
 
 
+class Match(models.Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", lhs_params + rhs_params
+
+
+class FullTextField(models.TextField):
+    pass
+
+
+FullTextField.register_lookup(Match)
+
+
+class PostSearch(models.Model):
+    # Виртуальная таблица FTS5 (миграция 0011_post_search): rowid совпадает
+    # с id публикации, а скрытый столбец с именем таблицы — весь документ,
+    # по которому работает MATCH.
+    post = models.OneToOneField(
+        Post,
+        primary_key=True,
+        db_column="rowid",
+        on_delete=models.DO_NOTHING,
+        related_name="search_index",
+    )
+    title = models.TextField()
+    text = models.TextField()
+    document = FullTextField(db_column="blog_post_search")
+
+    class Meta:
+        managed = False
+        db_table = "blog_post_search"
+
+
 class Comment(models.Model):
     text = models.TextField("Текст комментария")
     post = models.ForeignKey(
@@ -107,6 +187,58 @@ class Comment(models.Model):
         verbose_name = "комментарий"
         verbose_name_plural = "Комментарии"
         ordering = ("created_at",)
+        indexes = (
+            models.Index(
+                fields=("post", "created_at"),
+                name="comment_post_created_idx",
+            ),
+        )
 
     def get_absolute_url(self):
-        return reverse("users:profile", kwargs={"username": self.author.username})
+        return author_profile_url(self)
+
+
+class Job(models.Model):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (PENDING, "В очереди"),
+        (RUNNING, "Выполняется"),
+        (DONE, "Готово"),
+        (FAILED, "Ошибка"),
+    )
+
+    kind = models.CharField("Тип задачи", max_length=64)
+    payload = models.JSONField("Параметры", default=dict, blank=True)
+    status = models.CharField(
+        "Состояние", max_length=16, choices=STATUS_CHOICES, default=PENDING
+    )
+    attempts = models.PositiveSmallIntegerField("Попыток", default=0)
+    run_after = models.DateTimeField(
+        "Не раньше",
+        default=timezone.now,
+        help_text="Повторные попытки откладываются с растущей паузой.",
+    )
+    started_at = models.DateTimeField("Начата", null=True, blank=True)
+    last_error = models.TextField("Последняя ошибка", blank=True)
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name="Добавлено"
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Изменено")
+
+    class Meta:
+        verbose_name = "фоновая задача"
+        verbose_name_plural = "Фоновые задачи"
+        ordering = ("-created_at",)
+        indexes = (
+            models.Index(
+                fields=("run_after",),
+                name="job_pending_idx",
+                condition=models.Q(status="pending"),
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk}"
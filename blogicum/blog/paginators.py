@@ -0,0 +1,202 @@
+import base64
+import json
+from collections.abc import Sequence
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from .cache import content_version, timeout_until
+
+
+class KeysetPage(Sequence):
+    is_keyset = True
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    # Курсор хранит значения полей сортировки крайней записи страницы,
+    # поэтому любая страница стоит столько же, сколько первая, и COUNT(*)
+    # не нужен. Последнее поле ordering должно быть уникальным.
+
+    def __init__(
+        self, object_list, per_page, ordering=("-pub_date", "id"), columns=None
+    ):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = [name.lstrip("-") for name in self.ordering]
+        # Для кортежей из values_list(): имена столбцов по порядку.
+        self.columns = list(columns) if columns is not None else None
+
+    def get_page(self, after=None, before=None):
+        values = self.decode_cursor(after or before)
+        backwards = values is not None and not after
+        ordering = self.ordering
+        if backwards:
+            ordering = tuple(self._reverse(name) for name in ordering)
+
+        queryset = self.object_list.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._seek(ordering, values))
+        items = list(queryset[: self.per_page + 1])
+        has_more = len(items) > self.per_page
+        items = items[: self.per_page]
+        if backwards:
+            if not items:
+                # Курсор до начала данных — устаревший или подделанный:
+                # показываем первую страницу, как для испорченного курсора.
+                return self.get_page()
+            items.reverse()
+
+        has_next = has_more if not backwards else values is not None
+        has_previous = values is not None if not backwards else has_more
+        return KeysetPage(
+            items,
+            self,
+            next_cursor=(
+                self.encode_cursor(items[-1]) if has_next and items else None
+            ),
+            previous_cursor=(
+                self.encode_cursor(items[0])
+                if has_previous and items
+                else None
+            ),
+        )
+
+    def encode_cursor(self, item):
+        values = [self._value(item, name) for name in self.fields]
+        # isoformat() вместо DjangoJSONEncoder: тот обрезает микросекунды,
+        # и курсор перестал бы точно совпадать с pub_date в базе.
+        raw = json.dumps(
+            values, default=lambda value: value.isoformat()
+        ).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, token):
+        if not token:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            values = json.loads(raw)
+            if len(values) != len(self.fields):
+                return None
+            return [
+                self._to_python(name, value)
+                for name, value in zip(self.fields, values)
+            ]
+        except (ValueError, TypeError, ValidationError):
+            # Испорченный курсор ведёт на первую страницу — так же, как
+            # Paginator.get_page поступает с некорректным номером.
+            return None
+
+    def _to_python(self, name, value):
+        try:
+            field = self.object_list.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Аннотация, например ранг поиска: JSON уже дал нужный тип.
+            return value
+        return field.to_python(value)
+
+    def _value(self, item, name):
+        if self.columns is not None:
+            return item[self.columns.index(name)]
+        if isinstance(item, dict):
+            return item[name]
+        return getattr(item, name)
+
+    @staticmethod
+    def _reverse(name):
+        return name[1:] if name.startswith("-") else f"-{name}"
+
+    @staticmethod
+    def _seek(ordering, values):
+        # (a, b) после (x, y): a < x OR (a = x AND b < y) для убывающих полей.
+        conditions = []
+        for position, name in enumerate(ordering):
+            field = name.lstrip("-")
+            lookup = "lt" if name.startswith("-") else "gt"
+            equal = {
+                other.lstrip("-"): value
+                for other, value in zip(ordering[:position], values)
+            }
+            equal[f"{field}__{lookup}"] = values[position]
+            conditions.append(Q(**equal))
+        return reduce(or_, conditions)
+
+
+class FeedPage(Page):
+    @property
+    def page_window(self):
+        return self.paginator.get_elided_page_range(
+            self.number, on_each_side=3, on_ends=1
+        )
+
+
+class WindowPaginator(Paginator):
+    def _get_page(self, *args, **kwargs):
+        return FeedPage(*args, **kwargs)
+
+
+class CachedCountPaginator(WindowPaginator):
+    # COUNT(*) по ленте кэшируется на короткое время, но не дольше, чем до
+    # выхода ближайшей отложенной публикации; любое изменение публикаций
+    # или категорий меняет версию содержимого и ключ.
+
+    def __init__(
+        self, object_list, per_page, cache_key, next_publication=None, **kwargs
+    ):
+        super().__init__(object_list, per_page, **kwargs)
+        self.cache_key = cache_key
+        self.next_publication = next_publication
+
+    @cached_property
+    def count(self):
+        key = f"blog:feed-count:{content_version()}:{self.cache_key}"
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            moment = (
+                self.next_publication() if self.next_publication else None
+            )
+            timeout = timeout_until(moment, settings.BLOG_FEED_COUNT_TIMEOUT)
+            cache.set(key, count, timeout)
+        return count
+
+
+def paginate_feed(
+    request, queryset, per_page, cache_key, next_publication=None
+):
+    if settings.BLOG_KEYSET_PAGINATION:
+        return KeysetPaginator(queryset, per_page).get_page(
+            after=request.GET.get("after"), before=request.GET.get("before")
+        )
+    paginator = CachedCountPaginator(
+        queryset, per_page, cache_key, next_publication=next_publication
+    )
+    return paginator.get_page(request.GET.get("page"))
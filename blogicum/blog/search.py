@@ -0,0 +1,171 @@
+import re
+import threading
+from functools import lru_cache
+
+import snowballstemmer
+from django.db import connection, transaction
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Post, PostSearch
+
+SEARCH_TABLE = PostSearch._meta.db_table
+# Веса столбцов для bm25: совпадение в заголовке важнее, чем в тексте.
+TITLE_WEIGHT = 10.0
+TEXT_WEIGHT = 1.0
+SNIPPET_WORDS = 24
+MAX_TERMS = 10
+WORD_RE = re.compile(r"\w+")
+
+_local = threading.local()
+
+
+def _stemmer():
+    # Стеммер хранит состояние разбора слова, поэтому у каждого потока свой.
+    stemmer = getattr(_local, "stemmer", None)
+    if stemmer is None:
+        stemmer = _local.stemmer = snowballstemmer.stemmer("russian")
+    return stemmer
+
+
+@lru_cache(maxsize=100_000)
+def stem(word):
+    # «Кошками», «кошке» и «кошка» дают одну основу «кошк»; ё и е тоже
+    # совпадают. Латиница остаётся как есть, только в нижнем регистре.
+    return _stemmer().stemWord(word.lower())
+
+
+def stems(text):
+    return [stem(word) for word in WORD_RE.findall(text)]
+
+
+def search_terms(query):
+    return list(dict.fromkeys(stems(query)))[:MAX_TERMS]
+
+
+def match_expression(terms):
+    # Каждая основа в кавычках: иначе AND, OR, NEAR, * и двоеточия из
+    # запроса пользователя стали бы синтаксисом FTS5.
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def stem_rows(rows):
+    # rows — кортежи (pk, title, text). В индексе лежат основы слов, по одной
+    # на каждое слово исходного текста; сам текст выводится из blog_post.
+    return [
+        (pk, " ".join(stems(title)), " ".join(stems(text)))
+        for pk, title, text in rows
+    ]
+
+
+def write_index(rows):
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s",
+            [(row[0],) for row in rows],
+        )
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, title, text) "
+            "VALUES (%s, %s, %s)",
+            rows,
+        )
+    return len(rows)
+
+
+def index_rows(rows):
+    # Основы считаются до начала транзакции, чтобы не держать блокировку.
+    return write_index(stem_rows(rows))
+
+
+def index_available():
+    # Таблицу FTS5 миграция 0011 создаёт только в SQLite; на других базах
+    # сохранение и удаление публикаций индекс не трогают.
+    return connection.vendor == "sqlite"
+
+
+def index_post(post):
+    if index_available():
+        index_rows([(post.pk, post.title, post.text)])
+
+
+def post_batches(queryset, batch_size=500):
+    # Пачки по возрастанию pk, каждая — отдельный короткий запрос: курсор
+    # iterator() оставался бы открытым между пачками, а открытое чтение
+    # держит в SQLite разделяемую блокировку и мешает чужим записям.
+    rows = queryset.order_by("pk").values_list("pk", "title", "text")
+    batch = list(rows[:batch_size])
+    while batch:
+        yield batch
+        batch = list(rows.filter(pk__gt=batch[-1][0])[:batch_size])
+
+
+def reindex_posts(queryset, batch_size=500):
+    batches = post_batches(queryset, batch_size)
+    return sum(index_rows(batch) for batch in batches)
+
+
+def posts_since(since=None):
+    posts = Post.objects.all()
+    if since is not None:
+        posts = posts.filter(created_at__gte=since)
+    return posts
+
+
+def unindex_post(pk):
+    if not index_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [pk])
+
+
+def search_posts(queryset, query):
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+    return queryset.filter(
+        search_index__document__match=match_expression(terms)
+    ).annotate(
+        rank=RawSQL(
+            f"bm25({SEARCH_TABLE}, %s, %s)", (TITLE_WEIGHT, TEXT_WEIGHT)
+        ),
+    )
+
+
+def highlight(text, terms):
+    terms = set(terms)
+    parts = []
+    position = 0
+    for match in WORD_RE.finditer(text):
+        if stem(match.group()) in terms:
+            parts.append(escape(text[position:match.start()]))
+            parts.append(f"<mark>{escape(match.group())}</mark>")
+            position = match.end()
+    parts.append(escape(text[position:]))
+    return mark_safe("".join(parts))
+
+
+def snippet(text, terms, size=SNIPPET_WORDS):
+    # Окно из size слов, которое начинается незадолго до первого совпадения.
+    # Основы считаются только до него: дальше хватает границ слов.
+    terms = set(terms)
+    words = list(WORD_RE.finditer(text))
+    if not words:
+        return ""
+    first = next(
+        (
+            index
+            for index, word in enumerate(words)
+            if stem(word.group()) in terms
+        ),
+        0,
+    )
+    start = max(0, first - size // 4)
+    end = min(len(words), start + size)
+    # Края текста берутся целиком: кавычки и точка вокруг слов не теряются.
+    left = words[start].start() if start else 0
+    right = words[end - 1].end() if end < len(words) else len(text)
+    fragment = highlight(text[left:right], terms)
+    prefix = "…" if start else ""
+    suffix = "…" if end < len(words) else ""
+    return mark_safe(f"{prefix}{fragment}{suffix}")
@@ -0,0 +1,119 @@
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import bump_card_version, bump_content_version, remember_username
+from .images import schedule_release
+from .search import index_post, unindex_post
+from .models import Category, Comment, Location, Post
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F("comment_count") + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F("comment_count") - 1
+    )
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_image(
+    sender, instance, raw=False, update_fields=None, **kwargs
+):
+    instance._previous_image = None
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and "image" not in update_fields:
+        return
+    instance._previous_image = (
+        Post.objects.filter(pk=instance.pk)
+        .values_list("image", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Post)
+def release_replaced_image(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_image", None)
+    if previous and previous != instance.image.name:
+        transaction.on_commit(partial(schedule_release, previous))
+
+
+@receiver(post_delete, sender=Post)
+def release_deleted_image(sender, instance, **kwargs):
+    if instance.image:
+        transaction.on_commit(
+            partial(schedule_release, instance.image.name)
+        )
+
+
+@receiver(post_save, sender=Post)
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    indexed = {"title", "text"}
+    if update_fields is not None and indexed.isdisjoint(update_fields):
+        return
+    index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_search_index(sender, instance, **kwargs):
+    unindex_post(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_feeds(sender, **kwargs):
+    bump_content_version()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_post_cards(sender, **kwargs):
+    bump_card_version()
+
+
+@receiver(pre_save, sender=settings.AUTH_USER_MODEL)
+def remember_previous_username(
+    sender, instance, raw=False, update_fields=None, **kwargs
+):
+    instance._previous_username = None
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and "username" not in update_fields:
+        return
+    instance._previous_username = (
+        sender.objects.filter(pk=instance.pk)
+        .values_list("username", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def refresh_username(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and "username" not in update_fields:
+        return
+    remember_username(instance)
+    previous = getattr(instance, "_previous_username", None)
+    if previous is not None and previous != instance.username:
+        # Имя автора выводится в карточках и на страницах публикаций.
+        bump_card_version()
+        bump_content_version()
@@ -0,0 +1,49 @@
+import hashlib
+import os
+import posixpath
+import re
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+HASHED_NAME_RE = re.compile(r"(?:^|/)[0-9a-f]{64}\.\w+$")
+
+
+def is_content_addressed(name):
+    # Содержимое таких файлов под тем же именем никогда не меняется, их
+    # можно кэшировать навсегда. Уменьшенные копии (…_card.webp) сюда не
+    # входят: render_image перерисовывает их под прежним именем.
+    return bool(HASHED_NAME_RE.search(name))
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    # Файл называется SHA-256 своего содержимого: post_images/ab/ab12…ef.jpg.
+    # Одинаковые фото хранятся в одном экземпляре, а число ссылок на файл —
+    # это число публикаций с таким image (см. blog.images.release_image).
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        name = self.hashed_name(name, content)
+        if self.exists(name):
+            # Файл уже лежит и вот-вот получит новую ссылку: обновлённый mtime
+            # защищает его от release_image и gc_media, которые не удаляют
+            # свежие файлы.
+            os.utime(self.path(name))
+            return name
+        return super().save(name, content, max_length)
+
+    @staticmethod
+    def hashed_name(name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        digest = digest.hexdigest()
+        directory = posixpath.dirname(name)
+        extension = posixpath.splitext(name)[1].lower()
+        return posixpath.join(directory, digest[:2], f"{digest}{extension}")
@@ -0,0 +1,36 @@
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+
+from blog.cache import count_fragment_hit, post_card_key
+
+register = template.Library()
+
+
+class PostCardCacheNode(template.Node):
+    def __init__(self, nodelist, post):
+        self.nodelist = nodelist
+        self.post = post
+
+    def render(self, context):
+        key = post_card_key(self.post.resolve(context))
+        content = cache.get(key)
+        if settings.BLOG_FRAGMENT_CACHE_STATS:
+            count_fragment_hit(content is not None)
+        if content is None:
+            content = self.nodelist.render(context)
+            cache.set(key, content, settings.BLOG_FRAGMENT_CACHE_TIMEOUT)
+        return content
+
+
+@register.tag
+def cache_post_card(parser, token):
+    try:
+        _, post = token.split_contents()
+    except ValueError:
+        raise template.TemplateSyntaxError(
+            "Тег cache_post_card принимает ровно один аргумент — публикацию."
+        )
+    nodelist = parser.parse(("endcache_post_card",))
+    parser.delete_first_token()
+    return PostCardCacheNode(nodelist, parser.compile_filter(post))
@@ -0,0 +1,13 @@
+from django import template
+
+from blog.images import rendition_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_image_srcset(post, extension):
+    return ", ".join(
+        f"{rendition_url(post, rendition, extension)} {width}w"
+        for rendition, width in post.image_renditions.items()
+    )
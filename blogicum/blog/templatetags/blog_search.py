@@ -0,0 +1,8 @@
+from django import template
+
+from blog.search import highlight, snippet
+
+register = template.Library()
+
+register.filter("highlight", highlight)
+register.filter("snippet", snippet)
@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.core.files.uploadhandler import (
+    SkipFile,
+    TemporaryFileUploadHandler,
+)
+from django.http import QueryDict
+from django.template.defaultfilters import filesizeformat
+from django.utils.datastructures import MultiValueDict
+
+# Запас под текстовые поля формы публикации сверх размера самого фото.
+FORM_FIELDS_ALLOWANCE = 256 * 1024
+
+
+def upload_size_error():
+    size = filesizeformat(settings.BLOG_IMAGE_MAX_UPLOAD_SIZE)
+    return f"Файл слишком большой: можно загрузить фото не больше {size}."
+
+
+def parse_upload(request):
+    # Первое обращение к FILES разбирает тело запроса обработчиками из
+    # request.upload_handlers; после него заменить их уже нельзя.
+    return request.FILES
+
+
+class PostImageUploadHandler(TemporaryFileUploadHandler):
+    # Фото сразу пишется на диск кусками, без буфера в памяти, а загрузка
+    # сверх лимита прерывается, не дочитав тело запроса.
+
+    def handle_raw_input(
+        self,
+        input_data,
+        META,  # noqa: N803
+        content_length,
+        boundary,
+        encoding=None,
+    ):
+        limit = settings.BLOG_IMAGE_MAX_UPLOAD_SIZE + FORM_FIELDS_ALLOWANCE
+        if content_length > limit:
+            self.request.upload_too_large = True
+            # Пустые POST и FILES: парсер не читает тело вовсе.
+            return QueryDict(encoding=encoding), MultiValueDict()
+        return None
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        # Content-Length мог не учитывать фото целиком (или соврать).
+        self.received += len(raw_data)
+        if self.received > settings.BLOG_IMAGE_MAX_UPLOAD_SIZE:
+            self.file.close()
+            self.request.upload_error = upload_size_error()
+            raise SkipFile
+        return super().receive_data_chunk(raw_data, start)
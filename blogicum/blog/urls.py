@@ -1,17 +1,44 @@
 from django.urls import path
 
-from . import views
+from . import feeds, views
+from .asyncviews import page_view
 
 app_name = "blog"
 
 urlpatterns = [
-    path("", views.PostListView.as_view(), name="index"),
-    path("posts/<int:post_id>/", views.PostDetailView.as_view(), name="post_detail"),
+    path("", page_view(views.PostListView), name="index"),
+    path("feed/", feeds.PostFeed(), name="feed"),
+    path("feed/atom/", feeds.AtomPostFeed(), name="atom_feed"),
+    path(
+        "posts/<int:post_id>/",
+        page_view(views.PostDetailView),
+        name="post_detail",
+    ),
     path(
         "category/<slug:category_slug>/",
-        views.CategoryPostsView.as_view(),
+        page_view(views.CategoryPostsView),
         name="category_posts",
     ),
+    path(
+        "category/<slug:category_slug>/feed/",
+        feeds.CategoryPostFeed(),
+        name="category_feed",
+    ),
+    path(
+        "category/<slug:category_slug>/feed/atom/",
+        feeds.AtomCategoryPostFeed(),
+        name="category_atom_feed",
+    ),
+    path(
+        "profile/<str:username>/feed/",
+        feeds.AuthorPostFeed(),
+        name="author_feed",
+    ),
+    path(
+        "profile/<str:username>/feed/atom/",
+        feeds.AtomAuthorPostFeed(),
+        name="author_atom_feed",
+    ),
     path("posts/create/", views.PostCreateView.as_view(), name="create_post"),
     path("posts/<int:post_id>/edit/", views.PostEditView.as_view(), name="edit_post"),
     path(
@@ -19,6 +46,11 @@ urlpatterns = [
         views.PostDeleteView.as_view(),
         name="delete_post",
     ),
+    path(
+        "posts/<int:post_id>/comments/",
+        views.PostCommentsView.as_view(),
+        name="post_comments",
+    ),
     path(
         "posts/<int:post_id>/comment/",
         views.CommentCreateView.as_view(),
@@ -34,4 +66,6 @@ urlpatterns = [
         views.CommentDeleteView.as_view(),
         name="delete_comment",
     ),
+    path("search/", views.PostSearchView.as_view(), name="search"),
+    path("jobs/", views.JobStatusView.as_view(), name="job_status"),
 ]
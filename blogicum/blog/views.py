@@ -1,4 +1,4 @@
-from django.shortcuts import get_object_or_404, redirect
+from django.shortcuts import get_object_or_404, redirect, render
 from django.views.generic import (
     CreateView,
     UpdateView,
@@ -6,13 +6,39 @@ from django.views.generic import (
     DetailView,
     DeleteView,
 )
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.conf import settings
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.core.cache import cache
 from django.urls import reverse_lazy
 from django.utils import timezone
+from django.utils.http import urlencode
 from .forms import PostForm, CommentForm
-from .models import Post, Category, Comment
+from .cache import (
+    card_version,
+    content_version,
+    next_publication,
+    page_cache_key,
+    page_validators,
+    timeout_until,
+)
+from .models import Post, Category, Comment, Job
+from .paginators import KeysetPaginator, WindowPaginator, paginate_feed
+from .search import search_posts, search_terms
 from django.db.models import Count
-from django.http import Http404
+from django.db.models.functions import Substr
+from django.http import Http404, HttpResponse
+from django.utils.decorators import method_decorator
+from django.utils.functional import cached_property
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from django.views.decorators.http import condition
+from django.views.static import serve
+from .storage import is_content_addressed
+from .uploadhandlers import PostImageUploadHandler, parse_upload
+
+# Карточка в ленте выводит только первые слова текста (truncatewords:10),
+# поэтому полный текст из базы не забираем.
+FEED_TEXT_PREVIEW_LENGTH = 500
+
 
 def get_posts(data):
     return (
@@ -23,26 +49,144 @@ def get_posts(data):
         )
     )
 
-def get_comments(data):
+
+def get_scheduled(data):
+    return data.filter(
+        is_published=True,
+        pub_date__gt=timezone.now(),
+        category__is_published=True,
+    )
+
+
+def get_feed(data):
     return (
         data
-        .select_related("author")
-        .annotate(comment_count=Count("comments"))
+        .select_related("author", "category", "location")
+        .defer("text", "created_at", "category__description")
+        .annotate(
+            text_preview=Substr("text", 1, FEED_TEXT_PREVIEW_LENGTH)
+        )
         .order_by("-pub_date")
-    ) 
+    )
+
+
+class ScheduledPublicationMixin:
+    # Отложенные публикации появляются в ленте без сохранения модели,
+    # поэтому кэш ленты живёт не дольше, чем до ближайшей из них.
+
+    def get_scheduled_posts(self):
+        return None
 
-class CategoryPostsView(ListView):
+    @cached_property
+    def next_publication(self):
+        scheduled = self.get_scheduled_posts()
+        return next_publication(scheduled) if scheduled is not None else None
+
+
+class AnonymousPageCacheMixin(ScheduledPublicationMixin):
+    # Гостям отдаём готовую страницу из кэша. Авторизованным пользователям
+    # шапка и страница поста показывают личные ссылки, их не кэшируем.
+    # Вместе со страницей хранятся её ETag и Last-Modified: гость, у которого
+    # страница уже есть, получает 304 без запросов к базе, а при промахе
+    # кэша — после одного агрегата, до основных запросов и шаблона.
+
+    # Даты комментариев в Last-Modified: только для страницы одной
+    # публикации, в лентах хватает comment_count.
+    validate_comments = False
+
+    def get_validated_posts(self):
+        # Публикации, из которых собраны ETag и Last-Modified; по умолчанию
+        # вся лента.
+        return get_posts(Post.objects)
+
+    def get_validator_versions(self):
+        # Категории и местоположения без дат изменения учитывает версия
+        # карточек.
+        return (card_version(),)
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method != "GET" or request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+
+        key = page_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            content, etag, last_modified = cached
+        else:
+            content = None
+            etag, last_modified = page_validators(
+                self.get_validated_posts(),
+                comments=self.validate_comments,
+                extra=self.get_validator_versions(),
+            )
+        dispatch = super().dispatch
+
+        @condition(
+            etag_func=lambda request, *args, **kwargs: etag,
+            last_modified_func=lambda request, *args, **kwargs: last_modified,
+        )
+        def respond(request, *args, **kwargs):
+            if content is not None:
+                return HttpResponse(content)
+            response = dispatch(request, *args, **kwargs)
+            if response.status_code == 200:
+                response.add_post_render_callback(
+                    lambda rendered: cache.set(
+                        key,
+                        (rendered.content, etag, last_modified),
+                        timeout_until(
+                            self.next_publication,
+                            settings.BLOG_PAGE_CACHE_TIMEOUT,
+                        ),
+                    )
+                )
+            return response
+
+        return respond(request, *args, **kwargs)
+
+
+class FeedPaginationMixin(ScheduledPublicationMixin):
+    feed_name = None
+
+    def get_feed_name(self):
+        return self.feed_name
+
+    def paginate_queryset(self, queryset, page_size):
+        page = paginate_feed(
+            self.request,
+            queryset,
+            page_size,
+            self.get_feed_name(),
+            next_publication=lambda: self.next_publication,
+        )
+        return page.paginator, page, page.object_list, page.has_other_pages()
+
+
+class CategoryPostsView(
+    AnonymousPageCacheMixin, FeedPaginationMixin, ListView
+):
     model = Post
     template_name = "blog/category.html"
     context_object_name = "posts"
     paginate_by = 10
 
+    def get_validated_posts(self):
+        return get_posts(
+            Post.objects.filter(category__slug=self.kwargs["category_slug"])
+        )
+
+    def get_feed_name(self):
+        return f"category:{self.category.slug}"
+
+    def get_scheduled_posts(self):
+        return get_scheduled(Post.objects.filter(category=self.category))
+
     def get_queryset(self):
         self.category = get_object_or_404(
             Category, slug=self.kwargs["category_slug"], is_published=True
         )
         return (
-            get_comments(get_posts(Post.objects.filter(category=self.category)))
+            get_feed(get_posts(Post.objects.filter(category=self.category)))
         )
 
     def get_context_data(self, **kwargs):
@@ -51,19 +195,116 @@ class CategoryPostsView(ListView):
         return context
 
 
-class PostListView(ListView):
+class PostListView(AnonymousPageCacheMixin, FeedPaginationMixin, ListView):
     model = Post
     template_name = "blog/index.html"
     context_object_name = "posts"
     paginate_by = 10
+    feed_name = "index"
+
+    def get_scheduled_posts(self):
+        return get_scheduled(Post.objects)
 
     def get_queryset(self):
         return (
-            get_comments(get_posts(Post.objects))
+            get_feed(get_posts(Post.objects))
+        )
+
+
+class PostSearchView(ListView):
+    template_name = "blog/search.html"
+    context_object_name = "posts"
+    paginate_by = 10
+
+    def get_queryset(self):
+        self.query = self.request.GET.get("q", "").strip()
+        posts = (
+            get_posts(Post.objects)
+            .select_related("author", "category", "location")
+            .defer("category__description")
         )
+        return search_posts(posts, self.query)
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(
+            queryset, page_size, ordering=("rank", "id")
+        )
+        page = paginator.get_page(
+            after=self.request.GET.get("after"),
+            before=self.request.GET.get("before"),
+        )
+        return page.paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["query"] = self.query
+        context["terms"] = search_terms(self.query)
+        if self.query:
+            context["page_query"] = urlencode({"q": self.query})
+        return context
+
+
+class OnlyAuthorMixin:
+    # Объект загружается один раз: проверка авторства сравнивает author_id,
+    # не загружая автора, а get/post в UpdateView и DeleteView получают
+    # уже загруженный объект.
+
+    def dispatch(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        if self.object.author_id != request.user.pk:
+            return redirect("blog:post_detail", post_id=self.kwargs["post_id"])
+        return super().dispatch(request, *args, **kwargs)
 
+    def get_object(self, queryset=None):
+        if getattr(self, "object", None) is not None:
+            return self.object
+        return super().get_object(queryset)
+
+
+def serve_media(request, path, document_root=None):
+    response = serve(request, path, document_root=document_root)
+    if response.status_code == 200 and is_content_addressed(path):
+        # Новое содержимое получает новое имя, поэтому файл по этому адресу
+        # не изменится и браузеру незачем его перепроверять.
+        response["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
+
+
+class PostImageUploadMixin:
+    # Обработчики загрузки можно заменить только до того, как тело запроса
+    # разобрано, а CsrfViewMiddleware разбирает его раньше view. Поэтому
+    # проверка CSRF переносится внутрь, после замены обработчиков. Миксин
+    # ставится после проверок входа и авторства: тело запроса читается
+    # только для тех, кому правка разрешена.
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+    def dispatch(self, request, *args, **kwargs):
+        request.upload_handlers = [PostImageUploadHandler(request)]
+        if request.method == "POST":
+            parse_upload(request)
+        if getattr(request, "upload_too_large", False):
+            return render(
+                request,
+                "pages/413.html",
+                {"max_size": settings.BLOG_IMAGE_MAX_UPLOAD_SIZE},
+                status=413,
+            )
+        return self.protected_dispatch(request, *args, **kwargs)
+
+    @method_decorator(csrf_protect)
+    def protected_dispatch(self, request, *args, **kwargs):
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs["upload_error"] = getattr(self.request, "upload_error", None)
+        return kwargs
+
+
+class PostCreateView(LoginRequiredMixin, PostImageUploadMixin, CreateView):
     model = Post
     form_class = PostForm
     template_name = "blog/create.html"
@@ -73,36 +314,49 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
-class PostEditView(LoginRequiredMixin, UpdateView):
+class PostEditView(
+    LoginRequiredMixin, OnlyAuthorMixin, PostImageUploadMixin, UpdateView
+):
     model = Post
     form_class = PostForm
     template_name = "blog/create.html"
     pk_url_kwarg = "post_id"
 
-    def dispatch(self, request, *args, **kwargs):
-        post = self.get_object()
-        if post.author != request.user:
-            return redirect("blog:post_detail", post_id=post.pk)
-        return super().dispatch(request, *args, **kwargs)
-
 
-class PostDeleteView(LoginRequiredMixin, DeleteView):
+class PostDeleteView(LoginRequiredMixin, OnlyAuthorMixin, DeleteView):
     model = Post
     template_name = "blog/create.html"
     success_url = reverse_lazy("blog:index")
     pk_url_kwarg = "post_id"
 
-    def dispatch(self, request, *args, **kwargs):
-        post = self.get_object()
-        if post.author != request.user:
-            return redirect("blog:post_detail", post_id=post.pk)
-        return super().dispatch(request, *args, **kwargs)
+
+def paginate_comments(post, after=None):
+    paginator = KeysetPaginator(
+        post.comments.select_related("author"),
+        settings.BLOG_COMMENTS_PER_PAGE,
+        ordering=("created_at", "id"),
+    )
+    return paginator.get_page(after=after)
 
 
-class PostDetailView(DetailView):
+class VisiblePostMixin:
     model = Post
-    template_name = "blog/detail.html"
     pk_url_kwarg = "post_id"
+    validate_comments = True
+
+    def get_validated_posts(self):
+        # Те же условия видимости, что и в get_object(): для поста, который
+        # гость не видит, валидаторов нет и заголовки не выставляются.
+        return Post.objects.filter(
+            pk=self.kwargs["post_id"],
+            is_published=True,
+            pub_date__lte=timezone.now(),
+        )
+
+    def get_validator_versions(self):
+        # Текст комментария меняется без даты изменения, поэтому здесь в
+        # ETag входит версия всего содержимого, как и в ключ кэша страницы.
+        return (content_version(),)
 
     def get_object(self, queryset=None):
         post = super().get_object(queryset)
@@ -115,16 +369,30 @@ class PostDetailView(DetailView):
 
         return post
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["comments"] = paginate_comments(
+            self.object, self.request.GET.get("after")
+        )
+        return context
+
+
+class PostDetailView(VisiblePostMixin, AnonymousPageCacheMixin, DetailView):
+    template_name = "blog/detail.html"
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["user"] = self.request.user
         context["form"] = CommentForm()
-        context["comments"] = self.object.comments.select_related("author").order_by(
-            "created_at"
-        )
         return context
 
 
+class PostCommentsView(VisiblePostMixin, AnonymousPageCacheMixin, DetailView):
+    # Следующие страницы комментариев: только сам список, без страницы
+    # публикации, его подставляет на место кнопки «Показать ещё» скрипт.
+    template_name = "includes/comment_list.html"
+
+
 class CommentCreateView(LoginRequiredMixin, CreateView):
     model = Comment
     form_class = CommentForm
@@ -142,14 +410,14 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
         return reverse_lazy("blog:post_detail", kwargs=context)
 
 
-class CommentUpdateView(LoginRequiredMixin, UpdateView):
+class CommentUpdateView(LoginRequiredMixin, OnlyAuthorMixin, UpdateView):
     model = Comment
     form_class = CommentForm
     template_name = "blog/comment.html"
     pk_url_kwarg = "comment_id"
 
     def get_queryset(self):
-        return Comment.objects.filter(author=self.request.user)
+        return Comment.objects.filter(post_id=self.kwargs["post_id"])
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -157,20 +425,20 @@ class CommentUpdateView(LoginRequiredMixin, UpdateView):
         return context
 
     def get_success_url(self):
-        context = {"post_id": self.object.post.pk}
+        context = {"post_id": self.object.post_id}
         return reverse_lazy(
             "blog:post_detail",
             kwargs=context,
         )
 
 
-class CommentDeleteView(LoginRequiredMixin, DeleteView):
+class CommentDeleteView(LoginRequiredMixin, OnlyAuthorMixin, DeleteView):
     model = Comment
     template_name = "blog/comment.html"
     pk_url_kwarg = "comment_id"
 
     def get_queryset(self):
-        return Comment.objects.filter(author=self.request.user)
+        return Comment.objects.filter(post_id=self.kwargs["post_id"])
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -179,8 +447,45 @@ class CommentDeleteView(LoginRequiredMixin, DeleteView):
         return context
 
     def get_success_url(self):
-        context = {"post_id": self.object.post.pk}
+        context = {"post_id": self.object.post_id}
         return reverse_lazy(
             "blog:post_detail",
             kwargs=context,
         )
+
+
+class JobStatusView(LoginRequiredMixin, UserPassesTestMixin, ListView):
+    model = Job
+    template_name = "blog/jobs.html"
+    paginate_by = 50
+    paginator_class = WindowPaginator
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    @cached_property
+    def status(self):
+        status = self.request.GET.get("status")
+        return status if status in dict(Job.STATUS_CHOICES) else None
+
+    def get_queryset(self):
+        queryset = Job.objects.defer("payload")
+        if self.status:
+            queryset = queryset.filter(status=self.status)
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if self.status:
+            # Ссылки на страницы сохраняют фильтр.
+            context["page_query"] = urlencode({"status": self.status})
+        counts = dict(
+            Job.objects.order_by()
+            .values_list("status")
+            .annotate(total=Count("pk"))
+        )
+        context["status_counts"] = [
+            (status, label, counts.get(status, 0))
+            for status, label in Job.STATUS_CHOICES
+        ]
+        return context
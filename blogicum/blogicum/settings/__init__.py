@@ -0,0 +1,19 @@
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+# Профиль выбирает переменная окружения BLOGICUM_ENV, чтобы manage.py,
+# wsgi.py, asgi.py и тесты по-прежнему ссылались на blogicum.settings.
+# Модуль профиля можно указать и прямо:
+# DJANGO_SETTINGS_MODULE=blogicum.settings.production.
+profile = os.environ.get("BLOGICUM_ENV", "development")
+
+if profile == "development":
+    from .development import *  # noqa: F401, F403
+elif profile == "production":
+    from .production import *  # noqa: F401, F403
+else:
+    raise ImproperlyConfigured(
+        f"Неизвестный профиль настроек BLOGICUM_ENV={profile!r}: "
+        "ожидается development или production."
+    )
@@ -8,28 +8,33 @@ https://docs.djangoproject.com/en/3.2/topics/settings/
 
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
+
+Общие настройки профилей development и production; профиль выбирается
+в blogicum/settings/__init__.py.
 """
 
 import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
-BASE_DIR = Path(__file__).resolve().parent.parent
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/3.2/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = "django-insecure-evahzu3abuz-5jjn+gl5sk304skzho+%13gymq2j-hp1^*2iz8"
+SECRET_KEY = os.environ.get(
+    "DJANGO_SECRET_KEY",
+    "django-insecure-evahzu3abuz-5jjn+gl5sk304skzho+%13gymq2j-hp1^*2iz8",
+)
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = False
 
-ALLOWED_HOSTS = [
-    "localhost",
-    "127.0.0.1",
-]
+ALLOWED_HOSTS = os.environ.get(
+    "DJANGO_ALLOWED_HOSTS", "localhost,127.0.0.1"
+).split(",")
 
 TIME_ZONE = "Europe/Saratov"
 
@@ -46,8 +51,51 @@ MEDIA_ROOT = BASE_DIR / "media"
 
 LOGIN_REDIRECT_URL = "blog:index"
 
+LOGIN_URL = "login"
+
 CSRF_FAILURE_VIEW = "pages.views.csrf_failure"
 
+# Постраничный вывод лент по курсору (?after=/?before=) вместо номеров страниц
+BLOG_KEYSET_PAGINATION = False
+# Сколько комментариев выводить на странице публикации и подгружать за раз
+BLOG_COMMENTS_PER_PAGE = 50
+# Сколько записей отдаёт API на одной странице
+BLOG_API_PAGE_SIZE = 20
+# Асинхронные варианты лент, страниц публикаций и профилей (для ASGI)
+BLOG_ASYNC_VIEWS = False
+# Сколько потоков выполняют работу асинхронных страниц с базой и шаблонами
+BLOG_ASYNC_VIEW_THREADS = 8
+# Сколько секунд хранить в кэше число публикаций в ленте
+BLOG_FEED_COUNT_TIMEOUT = 60
+# Сколько секунд хранить в кэше страницы лент и публикаций для гостей
+BLOG_PAGE_CACHE_TIMEOUT = 300
+# Сколько секунд хранить в кэше отрисованные карточки публикаций
+BLOG_FRAGMENT_CACHE_TIMEOUT = 60 * 60
+# Считать попадания в кэш карточек для manage.py cache_stats: каждая
+# карточка добавляет обращение к кэшу, поэтому только для разработки
+BLOG_FRAGMENT_CACHE_STATS = False
+# Сколько секунд хранить в кэше имя пользователя для ссылок на профиль
+BLOG_USERNAME_CACHE_TIMEOUT = 5 * 60
+# Наибольший размер загружаемого фото публикации в байтах
+BLOG_IMAGE_MAX_UPLOAD_SIZE = 10 * 1024 * 1024
+# Наибольшее число пикселей в фото: защита от «бомб» — маленьких файлов,
+# которые распаковываются в гигантские изображения
+BLOG_IMAGE_MAX_PIXELS = 40_000_000
+# Фото моложе стольких секунд manage.py gc_media не удаляет: такое же
+# фото могли только что загрузить снова
+BLOG_IMAGE_MIN_AGE = 60 * 60
+# Через сколько секунд после замены или удаления публикации её фото
+# освобождается фоновой задачей; тронутое за это время фото остаётся
+BLOG_IMAGE_RELEASE_DELAY = 5 * 60
+# Сколько процессов manage.py run_worker запускает по умолчанию
+BLOG_WORKER_PROCESSES = 2
+# Сколько раз пытаться выполнить фоновую задачу, прежде чем сдаться
+BLOG_JOB_MAX_ATTEMPTS = 5
+# Пауза перед повтором в секундах; удваивается с каждой попыткой
+BLOG_JOB_RETRY_DELAY = 30
+# Через сколько секунд задача без ответа от воркера возвращается в очередь
+BLOG_JOB_TIMEOUT = 10 * 60
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -60,7 +108,6 @@ INSTALLED_APPS = [
     "blog",
     "pages",
     "users",
-    "debug_toolbar",
     "django_bootstrap5",
 ]
 
@@ -72,7 +119,6 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
 ]
 
 ROOT_URLCONF = "blogicum.urls"
@@ -153,7 +199,3 @@ STATICFILES_DIRS = [
 ]
 
 STATIC_URL = "/static/"
-
-INTERNAL_IPS = [
-    "127.0.0.1",
-]
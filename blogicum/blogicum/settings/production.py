@@ -0,0 +1,66 @@
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401, F403
+from .base import DATABASES, TEMPLATES
+
+DEBUG = False
+
+try:
+    SECRET_KEY = os.environ["DJANGO_SECRET_KEY"]
+except KeyError:
+    raise ImproperlyConfigured(
+        "Для профиля production задайте переменную окружения DJANGO_SECRET_KEY."
+    ) from None
+
+# Соединение с базой живёт между запросами, а не открывается для каждого.
+DATABASES = {
+    alias: {
+        **database,
+        "CONN_MAX_AGE": int(os.environ.get("DJANGO_CONN_MAX_AGE", 60)),
+    }
+    for alias, database in DATABASES.items()
+}
+
+# Шаблоны компилируются один раз на процесс. Загрузчики перечислены явно,
+# поэтому APP_DIRS выключен; контекстный процессор debug здесь не нужен.
+TEMPLATES = [
+    {
+        **template,
+        "APP_DIRS": False,
+        "OPTIONS": {
+            **template["OPTIONS"],
+            "context_processors": [
+                processor
+                for processor in template["OPTIONS"]["context_processors"]
+                if processor != "django.template.context_processors.debug"
+            ],
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
+        },
+    }
+    for template in TEMPLATES
+]
+
+# Кэш общий для всех процессов: версии ключей (bump_content_version и
+# bump_card_version) должны сразу видеть все воркеры, иначе каждый отдаёт
+# свои устаревшие страницы до истечения срока. По умолчанию — таблица в базе
+# (manage.py createcachetable), для нагруженной установки — memcached:
+# DJANGO_CACHE_BACKEND=django.core.cache.backends.memcached.PyMemcacheCache
+# и DJANGO_CACHE_LOCATION=127.0.0.1:11211.
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "DJANGO_CACHE_BACKEND", "django.core.cache.backends.db.DatabaseCache"
+        ),
+        "LOCATION": os.environ.get("DJANGO_CACHE_LOCATION", "blog_cache"),
+    }
+}
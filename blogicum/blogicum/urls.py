@@ -14,14 +14,17 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.apps import apps
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from blog.views import serve_media
 from users.views import Registrarion
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("api/v1/", include("blog.api.urls", namespace="api")),
     path("", include("blog.urls", namespace="blog")),
     path("pages/", include("pages.urls", namespace="pages")),
     path("auth/registration/", Registrarion.as_view(), name="registration"),
@@ -32,9 +35,14 @@ urlpatterns = [
 handler404 = "pages.views.page_not_found"
 handler500 = "pages.views.server_error"
 
-if settings.DEBUG:
+# debug_toolbar подключён только в профиле development.
+if settings.DEBUG and apps.is_installed("debug_toolbar"):
     import debug_toolbar
 
     # Добавить к списку urlpatterns список адресов из приложения debug_toolbar:
     urlpatterns += (path("__debug__/", include(debug_toolbar.urls)),)
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+if settings.DEBUG:
+    urlpatterns += static(
+        settings.MEDIA_URL, view=serve_media, document_root=settings.MEDIA_ROOT
+    )
@@ -1,9 +1,15 @@
 from django.urls import path
+
+from blog.asyncviews import page_view
 from . import views
 
 app_name = "users"
 
 urlpatterns = [
     path("profile/edit/", views.ProfileUpdateView.as_view(), name="edit_profile"),
-    path("profile/<str:username>/", views.ProfileDetailView.as_view(), name="profile"),
+    path(
+        "profile/<str:username>/",
+        page_view(views.ProfileDetailView),
+        name="profile",
+    ),
 ]
@@ -1,13 +1,16 @@
+from functools import partial
+
 from django.urls import reverse_lazy
 from django.contrib.auth.forms import UserCreationForm
 from django.views.generic import CreateView, UpdateView, DetailView
-from django.core.paginator import Paginator
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.utils import timezone
 from .forms import UserEditForm
 from .models import User
 from django.db.models import Count
-from blog.views import get_comments
+from blog.paginators import paginate_feed
+from blog.cache import next_publication
+from blog.views import get_feed
 
 class Registrarion(CreateView):
     form_class = UserCreationForm
@@ -28,14 +31,25 @@ class ProfileDetailView(DetailView):
         user = self.object
 
         posts = (
-            get_comments(user.posts)
+            get_feed(user.posts)
         )
 
+        feed_name = f"author:{user.pk}"
+        upcoming = None
         if self.request.user != user:
             now = timezone.now()
             posts = posts.filter(is_published=True, pub_date__lte=now)
+            scheduled = user.posts.filter(is_published=True, pub_date__gt=now)
+            upcoming = partial(next_publication, scheduled)
+            feed_name += ":published"
 
-        posts = Paginator(posts, 10).get_page(self.request.GET.get("page"))
+        posts = paginate_feed(
+            self.request,
+            posts,
+            self.paginate_by,
+            feed_name,
+            next_publication=upcoming,
+        )
 
         context["page_obj"] = posts
         context["is_owner"] = (
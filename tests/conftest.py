@@ -19,11 +19,13 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
 from django.test import override_settings
 from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
 from mixer.backend.django import mixer as _mixer
 
 N_PER_FIXTURE = 3
@@ -41,6 +43,16 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Откат транзакции после теста не вызывает сигналов, поэтому кэш лент
+    # из предыдущего теста иначе пережил бы его данные.
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+
+
 class SafeImportFromContextManager:
     def __init__(
         self,
@@ -132,6 +144,19 @@ def another_user_client(another_user):
     return client
 
 
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def get_with_queries(client, url, method="get", **kwargs):
+    # Ответ и SQL всех запросов к базе, сделанных при его подготовке.
+    with CaptureQueriesContext(connection) as ctx:
+        response = getattr(client, method)(url, **kwargs)
+    return response, [query["sql"] for query in ctx.captured_queries]
+
+
 def get_post_list_context_key(
     user_client, page_url, page_load_err_msg, key_missing_msg
 ):
@@ -365,6 +390,7 @@ def cleanup(request):
                 filename.endswith(".jpg")
                 or filename.endswith(".gif")
                 or filename.endswith(".png")
+                or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
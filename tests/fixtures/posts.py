@@ -138,3 +138,39 @@ def create_post_context_form_item(
         ),
     )
     return result
+
+
+@pytest.fixture
+def feed_posts(mixer: Mixer, user, published_category, published_location):
+    # Больше одной страницы ленты, от новых к старым: feed_posts[0] — первая
+    # карточка первой страницы.
+    now = timezone.now()
+    return mixer.cycle(N_PER_PAGE + 5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+        is_published=True,
+        pub_date=(now - timedelta(hours=hours) for hours in range(1, N_PER_PAGE + 6)),
+    )
+
+
+@pytest.fixture
+def make_post(mixer: Mixer, user, published_category, published_location):
+    # Опубликованный вчера пост; любое поле можно переопределить.
+    def make(title="Заголовок", text="Текст", **kwargs):
+        kwargs.setdefault("pub_date", timezone.now() - timedelta(days=1))
+        kwargs.setdefault("is_published", True)
+        kwargs.setdefault("author", user)
+        kwargs.setdefault("category", published_category)
+        kwargs.setdefault("location", published_location)
+        kwargs.setdefault("image", "")
+        return mixer.blend("blog.Post", title=title, text=text, **kwargs)
+
+    return make
+
+
+@pytest.fixture
+def page_urls(post_with_published_location):
+    post = post_with_published_location
+    return ["/", f"/category/{post.category.slug}/", f"/posts/{post.id}/"]
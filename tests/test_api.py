@@ -0,0 +1,121 @@
+import json
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.api.views import ApiListView
+from conftest import get_with_queries
+
+pytestmark = [pytest.mark.django_db]
+
+
+def payload(response):
+    if response.streaming:
+        return json.loads(b"".join(response.streaming_content))
+    return response.json()
+
+
+def collect(client, url, **params):
+    items = []
+    response = client.get(url, params)
+    while True:
+        assert response.status_code == HTTPStatus.OK
+        data = payload(response)
+        items += data["results"]
+        if data["next"] is None:
+            return items
+        response = client.get(data["next"])
+
+
+@override_settings(BLOG_API_PAGE_SIZE=2)
+def test_post_list_follows_publication_rules(client, make_post, mixer):
+    visible = [
+        make_post(f"Публикация {i}", pub_date=timezone.now() - timedelta(hours=i))
+        for i in range(1, 6)
+    ]
+    make_post("Черновик", is_published=False)
+    make_post("Отложенная", pub_date=timezone.now() + timedelta(days=1))
+    make_post(
+        "В скрытой категории",
+        category=mixer.blend("blog.Category", is_published=False),
+    )
+    items = collect(client, "/api/v1/posts/")
+    assert [item["id"] for item in items] == [post.id for post in visible]
+
+
+def test_post_fields(client, make_post, user, published_category):
+    post = make_post("Публикация")
+    item = client.get(f"/api/v1/posts/{post.id}/").json()
+    assert item["title"] == "Публикация"
+    assert item["author"] == user.username
+    assert item["category"] == published_category.slug
+    assert item["location"] == post.location.name
+    assert item["image"] is None
+    assert item["comment_count"] == 0
+
+
+def test_sparse_fieldsets(client, make_post):
+    post = make_post("Публикация")
+    response = client.get("/api/v1/posts/", {"fields": "title,author"})
+    assert payload(response)["results"] == [
+        {"title": "Публикация", "author": post.author.username}
+    ]
+    _, queries = get_with_queries(
+        client, f"/api/v1/posts/{post.id}/", data={"fields": "title"}
+    )
+    assert '"blog_post"."text"' not in queries[0]
+
+
+def test_unknown_field_is_rejected(client):
+    response = client.get("/api/v1/posts/", {"fields": "title,password"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "password" in response.json()["detail"]
+
+
+def test_unpublished_location_is_hidden(client, make_post):
+    post = make_post("Публикация")
+    post.location.is_published = False
+    post.location.save()
+    assert client.get(f"/api/v1/posts/{post.id}/").json()["location"] is None
+
+
+def test_category_posts(client, make_post, mixer):
+    other = mixer.blend("blog.Category", is_published=True)
+    post = make_post("В категории")
+    make_post("В другой категории", category=other)
+    items = collect(client, f"/api/v1/categories/{post.category.slug}/posts/")
+    assert [item["id"] for item in items] == [post.id]
+
+    hidden = mixer.blend("blog.Category", is_published=False)
+    response = client.get(f"/api/v1/categories/{hidden.slug}/posts/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {"detail": "Не найдено."}
+
+
+@override_settings(BLOG_API_PAGE_SIZE=2)
+def test_comments(client, make_post, mixer):
+    post = make_post("Публикация")
+    comments = mixer.cycle(5).blend("blog.Comment", post=post)
+    items = collect(client, f"/api/v1/posts/{post.id}/comments/", fields="id")
+    assert items == [{"id": comment.id} for comment in comments]
+
+
+def test_hidden_post_is_not_found(client, make_post):
+    post = make_post("Черновик", is_published=False)
+    for url in (f"/api/v1/posts/{post.id}/", f"/api/v1/posts/{post.id}/comments/"):
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND, url
+
+
+def test_api_is_read_only(user_client, make_post):
+    response = user_client.post("/api/v1/posts/", {"title": "Новая"})
+    assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
+
+
+def test_list_view_without_queryset_is_misconfigured(rf):
+    view = ApiListView(request=rf.get("/"), kwargs={})
+    with pytest.raises(ImproperlyConfigured):
+        view.get_queryset()
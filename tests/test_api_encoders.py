@@ -0,0 +1,47 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from blog.api import encoders
+from blog.api.encoders import RowEncoder, dumps
+
+MOMENT = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(encoders, "orjson", None)
+    elif encoders.orjson is None:
+        pytest.skip("orjson не установлен")
+    return request.param
+
+
+def test_dumps_formats(backend):
+    assert json.loads(dumps({"when": MOMENT, "text": "Привет", "none": None})) == {
+        "when": "2024-05-01T12:30:15.123456Z",
+        "text": "Привет",
+        "none": None,
+    }
+    assert "Привет".encode() in dumps("Привет")
+
+
+def test_stream_joins_chunks_into_one_array(backend, monkeypatch):
+    monkeypatch.setattr(encoders, "CHUNK_ROWS", 3)
+    monkeypatch.setattr(encoders, "CHUNK_BYTES", 10)
+    rows = [(index, f"Запись {index}", "лишний столбец") for index in range(10)]
+    encoder = RowEncoder(
+        ["title", "id"], [1, 0], converters={"title": str.upper, "skipped": str}
+    )
+    chunks = list(encoder.stream(rows, head=b'{"results":[', tail=b"]}"))
+    assert len(chunks) > 1
+    assert json.loads(b"".join(chunks)) == {
+        "results": [
+            {"title": f"ЗАПИСЬ {index}", "id": index} for index in range(10)
+        ]
+    }
+
+
+def test_stream_of_no_rows(backend):
+    assert b"".join(RowEncoder(["id"], [0]).stream([])) == b"[]"
@@ -0,0 +1,93 @@
+import asyncio
+import re
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.test import AsyncRequestFactory, RequestFactory, override_settings
+
+from blog import asyncviews
+from blog.asyncviews import async_view, page_view
+from blog.views import CategoryPostsView, PostDetailView, PostListView
+from users.views import ProfileDetailView
+
+# Потоки пула ходят в базу своими соединениями и не видят данных в
+# незавершённой транзакции теста.
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+def without_csrf(content):
+    return re.sub(rb'name="csrfmiddlewaretoken" value="[^"]+"', b"", content)
+
+
+@pytest.fixture
+def executor():
+    asyncviews.view_executor.cache_clear()
+    yield
+    asyncviews.view_executor().shutdown()
+    asyncviews.view_executor.cache_clear()
+
+
+def build_request(factory, url, user=None):
+    request = factory.get(url)
+    request.user = user or AnonymousUser()
+    return request
+
+
+@pytest.fixture
+def pages(post_with_published_location):
+    post = post_with_published_location
+    return [
+        (PostListView, "/", {}),
+        (CategoryPostsView, "/", {"category_slug": post.category.slug}),
+        (PostDetailView, "/", {"post_id": post.id}),
+        (ProfileDetailView, "/", {"username": post.author.username}),
+    ]
+
+
+def test_async_views_render_like_sync_ones(executor, pages, user):
+    # Под пользователем: страницы гостей сначала отдал бы кэш.
+    for view_class, url, kwargs in pages:
+        sync_response = view_class.as_view()(
+            build_request(RequestFactory(), url, user), **kwargs
+        )
+        sync_response.render()
+        response = async_to_sync(async_view(view_class))(
+            build_request(AsyncRequestFactory(), url, user), **kwargs
+        )
+        assert response.status_code == 200, view_class
+        assert without_csrf(response.content) == without_csrf(
+            sync_response.content
+        ), view_class
+
+
+@override_settings(BLOG_ASYNC_VIEW_THREADS=2)
+def test_work_runs_in_bounded_pool(executor, post_with_published_location):
+    threads = set()
+
+    class RecordingView(PostListView):
+        def get(self, request, *args, **kwargs):
+            threads.add(threading.current_thread().name)
+            return super().get(request, *args, **kwargs)
+
+    view = async_view(RecordingView)
+
+    async def load():
+        requests = [
+            build_request(AsyncRequestFactory(), f"/?page={index}")
+            for index in range(10)
+        ]
+        return await asyncio.gather(*(view(request) for request in requests))
+
+    responses = async_to_sync(load)()
+    assert all(response.status_code == 200 for response in responses)
+    assert 1 <= len(threads) <= 2
+    assert all(name.startswith("blog-view") for name in threads)
+
+
+def test_page_view_follows_setting():
+    with override_settings(BLOG_ASYNC_VIEWS=True):
+        assert asyncio.iscoroutinefunction(page_view(PostListView))
+    with override_settings(BLOG_ASYNC_VIEWS=False):
+        assert not asyncio.iscoroutinefunction(page_view(PostListView))
@@ -0,0 +1,56 @@
+import pytest
+
+from conftest import get_with_queries
+
+pytestmark = [pytest.mark.django_db]
+
+
+def table_queries(client, url, table):
+    response, queries = get_with_queries(client, url)
+    selects = [sql for sql in queries if sql.startswith(f'SELECT "{table}"')]
+    return response, selects
+
+
+@pytest.mark.parametrize("action", ["edit", "delete"])
+def test_post_is_fetched_once(user_client, post_with_published_location, action):
+    post = post_with_published_location
+    response, selects = table_queries(
+        user_client, f"/posts/{post.id}/{action}/", "blog_post"
+    )
+    assert response.status_code == 200
+    assert len(selects) == 1
+
+
+@pytest.mark.parametrize("action", ["edit_comment", "delete_comment"])
+def test_comment_is_fetched_once(
+    user_client, mixer, user, post_with_published_location, action
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    response, selects = table_queries(
+        user_client, f"/posts/{post.id}/{action}/{comment.id}/", "blog_comment"
+    )
+    assert response.status_code == 200
+    assert len(selects) == 1
+
+
+@pytest.mark.parametrize("action", ["edit_comment", "delete_comment"])
+def test_not_author_is_redirected_from_comment(
+    another_user_client, mixer, user, post_with_published_location, action
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    response = another_user_client.post(f"/posts/{post.id}/{action}/{comment.id}/")
+    assert response.status_code == 302
+    assert response.url == f"/posts/{post.id}/"
+    assert comment.__class__.objects.filter(pk=comment.pk).exists()
+
+
+def test_comment_of_another_post_is_not_found(
+    user_client, mixer, user, post_with_published_location, post_of_another_author
+):
+    comment = mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+    url = f"/posts/{post_of_another_author.id}/edit_comment/{comment.id}/"
+    assert user_client.get(url).status_code == 404
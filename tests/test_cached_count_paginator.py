@@ -0,0 +1,31 @@
+import pytest
+
+from blog.paginators import CachedCountPaginator
+from conftest import N_PER_PAGE, get_with_queries
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_count_is_cached_between_requests(user_client, feed_posts):
+    # Авторизованный клиент, чтобы не попасть в кэш страниц для гостей.
+    _, first = get_with_queries(user_client, "/")
+    _, second = get_with_queries(user_client, "/")
+    assert any("COUNT(" in sql for sql in first)
+    assert not any("COUNT(" in sql for sql in second)
+
+
+def test_count_is_invalidated_on_post_save_and_delete(client, mixer, feed_posts):
+    assert client.get("/").context["paginator"].count == len(feed_posts)
+
+    feed_posts[0].delete()
+    assert client.get("/").context["paginator"].count == len(feed_posts) - 1
+
+    mixer.blend("blog.Post", category=feed_posts[1].category, is_published=True)
+    assert client.get("/").context["paginator"].count == len(feed_posts)
+
+
+def test_page_window_is_elided():
+    paginator = CachedCountPaginator(list(range(15 * N_PER_PAGE)), N_PER_PAGE, "test")
+    window = list(paginator.get_page(7).page_window)
+    ellipsis = paginator.ELLIPSIS
+    assert window == [1, ellipsis, 4, 5, 6, 7, 8, 9, 10, ellipsis, 15]
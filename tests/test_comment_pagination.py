@@ -0,0 +1,87 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.models import Comment
+from conftest import get_with_queries
+
+pytestmark = [pytest.mark.django_db]
+
+PER_PAGE = 3
+
+
+@pytest.fixture
+def comments(mixer, post_with_published_location):
+    # Одинаковое время у части комментариев: порядок держится на id.
+    moment = timezone.now() - timedelta(hours=1)
+    items = mixer.cycle(PER_PAGE * 2 + 1).blend(
+        "blog.Comment",
+        post=post_with_published_location,
+        text=(f"Комментарий номер {i:02d}" for i in range(100)),
+    )
+    for index, comment in enumerate(items):
+        Comment.objects.filter(pk=comment.pk).update(
+            created_at=moment + timedelta(minutes=index // 2)
+        )
+    return items
+
+
+def texts(response):
+    return [comment.text for comment in response.context["comments"]]
+
+
+@override_settings(BLOG_COMMENTS_PER_PAGE=PER_PAGE)
+def test_comments_are_loaded_page_by_page(client, comments):
+    post_id = comments[0].post_id
+    response = client.get(f"/posts/{post_id}/")
+    assert texts(response) == [comment.text for comment in comments[:PER_PAGE]]
+    content = response.content.decode()
+    assert f"Комментарии ({len(comments)})" in content
+    assert comments[PER_PAGE].text not in content
+
+    seen = texts(response)
+    page = response.context["comments"]
+    while page.has_next():
+        response = client.get(
+            f"/posts/{post_id}/comments/", {"after": page.next_cursor}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert "<html" not in response.content.decode()
+        seen += texts(response)
+        page = response.context["comments"]
+    assert seen == [comment.text for comment in comments]
+
+
+@override_settings(BLOG_COMMENTS_PER_PAGE=PER_PAGE)
+def test_next_page_link_works_without_script(client, comments):
+    post_id = comments[0].post_id
+    cursor = client.get(f"/posts/{post_id}/").context["comments"].next_cursor
+    response = client.get(f"/posts/{post_id}/", {"after": cursor})
+    assert texts(response) == [
+        comment.text for comment in comments[PER_PAGE:PER_PAGE * 2]
+    ]
+
+
+@override_settings(BLOG_COMMENTS_PER_PAGE=PER_PAGE)
+def test_comment_page_queries_do_not_grow(user_client, mixer, comments):
+    post_id = comments[0].post_id
+    url = f"/posts/{post_id}/comments/"
+    _, small = get_with_queries(user_client, url)
+    mixer.cycle(20).blend("blog.Comment", post_id=post_id)
+    _, large = get_with_queries(user_client, url)
+    assert len(large) == len(small)
+
+
+def test_hidden_post_comments_are_not_found(client, mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=False,
+    )
+    mixer.blend("blog.Comment", post=post)
+    response = client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,90 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.test import RequestFactory
+from django.utils import timezone
+
+from blog.cache import page_cache_key
+from conftest import get_with_queries
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_not_modified(client, url, etag):
+    response, queries = get_with_queries(client, url, HTTP_IF_NONE_MATCH=etag)
+    return response, len(queries)
+
+
+def test_unchanged_pages_are_not_modified(client, page_urls):
+    for url in page_urls:
+        etag = client.get(url)["ETag"]
+        response, queries = get_not_modified(client, url, etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, url
+        assert queries == 0, url
+
+        # Без кэша страницы — только агрегат, без выборки и шаблона.
+        cache.delete(page_cache_key(RequestFactory().get(url)))
+        response, queries = get_not_modified(client, url, etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, url
+        assert queries == 1, url
+
+
+def test_if_modified_since_is_honoured(client, page_urls):
+    for url in page_urls:
+        last_modified = client.get(url)["Last-Modified"]
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, url
+
+
+def test_new_comment_changes_pages(
+    client, mixer, page_urls, post_with_published_location
+):
+    etags = {url: client.get(url)["ETag"] for url in page_urls}
+    mixer.blend("blog.Comment", post=post_with_published_location)
+    for url, etag in etags.items():
+        response, _ = get_not_modified(client, url, etag)
+        assert response.status_code == HTTPStatus.OK, url
+
+
+def test_edited_comment_changes_post_page(client, mixer, post_with_published_location):
+    comment = mixer.blend("blog.Comment", post=post_with_published_location)
+    url = f"/posts/{post_with_published_location.id}/"
+    etag = client.get(url)["ETag"]
+    comment.text = "Исправленный комментарий"
+    comment.save()
+    response, _ = get_not_modified(client, url, etag)
+    assert response.status_code == HTTPStatus.OK
+    assert "Исправленный комментарий" in response.content.decode()
+
+
+def test_renamed_category_changes_pages(
+    client, page_urls, post_with_published_location
+):
+    etags = {url: client.get(url)["ETag"] for url in page_urls}
+    category = post_with_published_location.category
+    category.title = "Новое название"
+    category.save()
+    for url, etag in etags.items():
+        response, _ = get_not_modified(client, url, etag)
+        assert response.status_code == HTTPStatus.OK, url
+
+
+def test_hidden_post_has_no_validators(client, mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    response = client.get(f"/posts/{post.id}/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert not response.has_header("ETag")
+
+
+def test_authenticated_users_get_full_pages(user_client, page_urls):
+    for url in page_urls:
+        response = user_client.get(url)
+        assert not response.has_header("ETag"), url
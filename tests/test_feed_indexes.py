@@ -0,0 +1,42 @@
+import pytest
+from django.db import connection
+
+from blog.models import Post
+from blog.views import get_feed, get_posts
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite", reason="EXPLAIN QUERY PLAN есть только в SQLite"
+    ),
+]
+
+
+def assert_uses_index(queryset, index_name):
+    plan = queryset.explain()
+    assert f"USING INDEX {index_name}" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
+
+
+def test_index_feed_uses_published_index():
+    assert_uses_index(get_feed(get_posts(Post.objects)), "post_published_feed_idx")
+
+
+def test_category_feed_uses_category_index(published_category):
+    queryset = get_feed(get_posts(Post.objects.filter(category=published_category)))
+    assert_uses_index(queryset, "post_category_feed_idx")
+
+
+@pytest.mark.parametrize("only_published", [False, True])
+def test_profile_feed_uses_author_index(user, only_published):
+    posts = get_feed(user.posts)
+    if only_published:
+        posts = get_posts(posts)
+    assert_uses_index(posts, "post_author_feed_idx")
+
+
+def test_post_comments_use_comment_index(post_with_published_location):
+    comments = post_with_published_location.comments.select_related(
+        "author"
+    ).order_by("created_at")
+    assert_uses_index(comments, "comment_post_created_idx")
@@ -0,0 +1,50 @@
+import pytest
+
+from conftest import N_PER_PAGE, get_with_queries
+
+pytestmark = [pytest.mark.django_db]
+
+# Запросы на страницу ленты не должны зависеть от числа карточек: агрегат
+# по публикациям для ETag и Last-Modified, COUNT(*) для пагинатора, одна
+# выборка постов со всеми связями и поиск ближайшей отложенной публикации
+# для срока жизни кэша.
+FEED_PAGE_QUERIES = 4
+
+
+def count_page_queries(client, url):
+    response, queries = get_with_queries(client, url)
+    assert response.status_code == 200
+    # Ленты не читают таблицу комментариев: число комментариев хранится в
+    # самой публикации.
+    assert not any("blog_comment" in sql for sql in queries)
+    return len(queries)
+
+
+@pytest.mark.parametrize("page", ["", "?page=2"])
+def test_index_feed_query_count(client, feed_posts, page):
+    assert count_page_queries(client, f"/{page}") == FEED_PAGE_QUERIES
+
+
+def test_category_feed_query_count(client, feed_posts):
+    url = f"/category/{feed_posts[0].category.slug}/"
+    # Плюс запрос самой категории.
+    assert count_page_queries(client, url) == FEED_PAGE_QUERIES + 1
+
+
+def test_profile_feed_query_count(client, feed_posts, user):
+    url = f"/profile/{user.username}/"
+    # Профиль не отвечает 304 и агрегата не делает, зато ищет владельца.
+    assert count_page_queries(client, url) == FEED_PAGE_QUERIES
+
+
+def test_feed_query_count_does_not_grow_with_page_size(
+    client, mixer, feed_posts
+):
+    before = count_page_queries(client, "/")
+    mixer.cycle(N_PER_PAGE).blend(
+        "blog.Post",
+        category__is_published=True,
+        location__is_published=True,
+        is_published=True,
+    )
+    assert count_page_queries(client, "/") == before
@@ -0,0 +1,93 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Post
+from conftest import get_with_queries
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed_urls(user, published_category):
+    return [
+        "/feed/",
+        "/feed/atom/",
+        f"/category/{published_category.slug}/feed/",
+        f"/category/{published_category.slug}/feed/atom/",
+        f"/profile/{user.username}/feed/",
+        f"/profile/{user.username}/feed/atom/",
+    ]
+
+
+def test_feeds_list_only_published_posts(client, make_post, feed_urls):
+    make_post("Видимая публикация")
+    make_post("Черновик", is_published=False)
+    make_post("Отложенная", pub_date=timezone.now() + timedelta(days=1))
+    for url in feed_urls:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, url
+        content = response.content.decode()
+        assert "Видимая публикация" in content, url
+        assert "Черновик" not in content, url
+        assert "Отложенная" not in content, url
+        assert response.has_header("ETag"), url
+        assert response.has_header("Last-Modified"), url
+
+
+def test_unchanged_feed_is_not_modified(client, make_post, feed_urls):
+    make_post("Публикация")
+    for url in feed_urls:
+        etag = client.get(url)["ETag"]
+        response, queries = get_with_queries(
+            client, url, HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, url
+        assert not response.content
+        # Только агрегат по публикациям и поиск категории или автора.
+        assert len(queries) <= 2, url
+
+
+def test_if_modified_since_is_honoured(client, make_post):
+    make_post("Публикация")
+    last_modified = client.get("/feed/")["Last-Modified"]
+    response = client.get("/feed/", HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_feed_changes_after_edit_and_unpublish(client, make_post):
+    first = make_post("Первая")
+    make_post("Вторая")
+    etag = client.get("/feed/")["ETag"]
+
+    Post.objects.filter(pk=first.pk).update(
+        title="Первая, исправленная", updated_at=timezone.now() + timedelta(seconds=1)
+    )
+    response = client.get("/feed/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert "Первая, исправленная" in response.content.decode()
+
+    etag = response["ETag"]
+    Post.objects.filter(pk=first.pk).update(is_published=False)
+    response = client.get("/feed/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert "Первая" not in response.content.decode()
+
+
+def test_missing_category_and_author_return_404(client, mixer):
+    hidden = mixer.blend("blog.Category", is_published=False)
+    assert client.get(f"/category/{hidden.slug}/feed/").status_code == 404
+    assert client.get("/profile/nobody-here/feed/").status_code == 404
+
+
+def test_pages_advertise_feeds(client, make_post, published_category, user):
+    make_post("Публикация")
+    assert 'href="/feed/"' in client.get("/").content.decode()
+    category_page = client.get(f"/category/{published_category.slug}/")
+    assert f'href="/category/{published_category.slug}/feed/"' in (
+        category_page.content.decode()
+    )
+    profile_page = client.get(f"/profile/{user.username}/")
+    assert f'href="/profile/{user.username}/feed/"' in profile_page.content.decode()
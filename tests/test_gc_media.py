@@ -0,0 +1,62 @@
+import os
+import time
+from io import StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+
+from blog.images import rendition_name
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("media_root")]
+
+
+def make_file(name, age=2 * 60 * 60):
+    name = default_storage.save(name, ContentFile(b"x" * 10))
+    moment = time.time() - age
+    os.utime(default_storage.path(name), (moment, moment))
+    return name
+
+
+def gc_media(*args):
+    out = StringIO()
+    call_command("gc_media", *args, stdout=out)
+    return out.getvalue()
+
+
+@pytest.fixture
+def files(user, published_category):
+    used = make_file("post_images/used.jpg")
+    Post.objects.create(
+        title="С фото",
+        text="Текст",
+        pub_date="2020-01-01T10:00Z",
+        author=user,
+        category=published_category,
+        image=used,
+    )
+    return {
+        "used": used,
+        "rendition": make_file(rendition_name(used, "card", "webp")),
+        "orphan": make_file("post_images/ab/orphan.jpg"),
+        "fresh": make_file("post_images/fresh.jpg", age=0),
+    }
+
+
+def test_deletes_only_old_unreferenced_files(files):
+    output = gc_media()
+
+    assert "Удалено: 1 (" in output
+    assert not default_storage.exists(files["orphan"])
+    for kept in ("used", "rendition", "fresh"):
+        assert default_storage.exists(files[kept])
+
+
+def test_dry_run_keeps_files(files):
+    output = gc_media("--dry-run")
+
+    assert files["orphan"] in output
+    assert "Можно удалить: 1" in output
+    assert default_storage.exists(files["orphan"])
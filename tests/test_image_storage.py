@@ -0,0 +1,163 @@
+import os
+import time
+from io import BytesIO
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.utils import timezone
+from PIL import Image
+
+from blog.images import rendition_name
+from blog.models import Job, Post
+from blog.views import serve_media
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("media_root")]
+
+
+def make_image(color):
+    buffer = BytesIO()
+    Image.new("RGB", (20, 20), color).save(buffer, "PNG")
+    return SimpleUploadedFile("Photo.PNG", buffer.getvalue(), "image/png")
+
+
+def create_post(user, category, color, title="С фото"):
+    return Post.objects.create(
+        title=title,
+        text="Текст",
+        pub_date="2020-01-01T10:00Z",
+        author=user,
+        category=category,
+        image=make_image(color),
+    )
+
+
+def stored_files(root):
+    return sorted(
+        path.relative_to(root).as_posix() for path in root.rglob("*") if path.is_file()
+    )
+
+
+def age_files(root, seconds=2 * 60 * 60):
+    # Освобождение не удаляет свежие файлы: их могли только что загрузить.
+    moment = time.time() - seconds
+    for path in root.rglob("*"):
+        os.utime(path, (moment, moment))
+
+
+def run_release_jobs():
+    # Отсрочка освобождения истекла.
+    Job.objects.filter(kind="release_image").update(run_after=timezone.now())
+    call_command("run_worker", workers=0, once=True)
+
+
+def test_identical_uploads_share_one_file(user, published_category, media_root):
+    first = create_post(user, published_category, "navy")
+    second = create_post(user, published_category, "navy")
+
+    assert first.image.name == second.image.name
+    assert first.image.name.startswith("post_images/")
+    assert first.image.name.endswith(".png")
+    assert stored_files(media_root) == [first.image.name]
+
+
+def test_file_is_removed_with_last_reference(
+    user, published_category, media_root, django_capture_on_commit_callbacks
+):
+    first = create_post(user, published_category, "navy")
+    second = create_post(user, published_category, "navy")
+    storage = first.image.storage
+    rendition = rendition_name(first.image.name, "card", "webp")
+    default_storage.save(rendition, make_image("navy"))
+    age_files(media_root)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    run_release_jobs()
+    assert storage.exists(second.image.name)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        second.delete()
+    run_release_jobs()
+    assert stored_files(media_root) == []
+
+
+def test_replaced_image_is_released(
+    user, published_category, media_root, django_capture_on_commit_callbacks
+):
+    post = create_post(user, published_category, "navy")
+    old_name = post.image.name
+    age_files(media_root)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        post.image = make_image("red")
+        post.save()
+    assert old_name in stored_files(media_root)
+
+    run_release_jobs()
+    assert post.image.name != old_name
+    assert stored_files(media_root) == [post.image.name]
+
+
+def test_release_waits_for_the_delay(
+    user, published_category, media_root, django_capture_on_commit_callbacks
+):
+    post = create_post(user, published_category, "navy")
+    age_files(media_root)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        post.delete()
+    call_command("run_worker", workers=0, once=True)
+
+    job = Job.objects.get(kind="release_image")
+    assert job.status == Job.PENDING
+    assert job.run_after > timezone.now()
+    assert stored_files(media_root) == [post.image.name]
+
+
+def test_reuploaded_file_is_left_for_gc_media(
+    user, published_category, media_root, django_capture_on_commit_callbacks
+):
+    post = create_post(user, published_category, "navy")
+    old_name = post.image.name
+    age_files(media_root)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        post.image = make_image("red")
+        post.save()
+    # Такое же фото загрузили снова, но публикацию так и не сохранили.
+    post.image.storage.save("post_images/photo.png", make_image("navy"))
+    run_release_jobs()
+
+    assert stored_files(media_root) == sorted([old_name, post.image.name])
+
+
+def test_identical_upload_refreshes_stored_file(
+    user, published_category, media_root
+):
+    first = create_post(user, published_category, "navy")
+    age_files(media_root)
+    path = media_root / first.image.name
+    before = path.stat().st_mtime
+
+    create_post(user, published_category, "navy")
+
+    assert path.stat().st_mtime > before
+
+
+def test_content_addressed_media_is_immutable(
+    rf, user, published_category, media_root
+):
+    post = create_post(user, published_category, "navy")
+    response = serve_media(rf.get("/"), post.image.name, document_root=media_root)
+    assert "immutable" in response["Cache-Control"]
+
+
+def test_renditions_are_not_immutable(rf, user, published_category, media_root):
+    post = create_post(user, published_category, "navy")
+    rendition = rendition_name(post.image.name, "card", "webp")
+    default_storage.save(rendition, make_image("navy"))
+    response = serve_media(rf.get("/"), rendition, document_root=media_root)
+    assert response.status_code == 200
+    assert not response.has_header("Cache-Control")
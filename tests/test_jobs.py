@@ -0,0 +1,119 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog import images
+from blog.jobs import claim, enqueue, release_stale
+from blog.models import Job
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post(post_with_published_location):
+    return post_with_published_location
+
+
+def run_worker():
+    call_command("run_worker", workers=0, once=True)
+
+
+def test_post_without_image_enqueues_nothing(
+    user_client,
+    published_category,
+    published_location,
+    django_capture_on_commit_callbacks,
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        user_client.post(
+            "/posts/create/",
+            data={
+                "title": "Без фото",
+                "text": "Текст",
+                "pub_date": "2020-01-01T10:00",
+                "category": published_category.pk,
+                "location": published_location.pk,
+                "is_published": True,
+            },
+        )
+    assert not Job.objects.exists()
+
+
+def test_job_is_claimed_once(post):
+    job = enqueue("render_post_image", post_id=post.pk)
+    assert claim(5) == [job.pk]
+    assert claim(5) == []
+    job.refresh_from_db()
+    assert job.status == Job.RUNNING
+    assert job.attempts == 1
+
+
+def test_worker_runs_job(post, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        images, "render_post_image_job", lambda post_id: calls.append(post_id)
+    )
+    job = enqueue("render_post_image", post_id=post.pk)
+
+    run_worker()
+
+    job.refresh_from_db()
+    assert job.status == Job.DONE
+    assert calls == [post.pk]
+
+
+def test_failed_job_is_retried_with_backoff(post, monkeypatch, settings):
+    settings.BLOG_JOB_MAX_ATTEMPTS = 2
+
+    def explode(post_id):
+        raise OSError("битый файл")
+
+    monkeypatch.setattr(images, "render_post_image_job", explode)
+    job = enqueue("render_post_image", post_id=post.pk)
+
+    run_worker()
+    job.refresh_from_db()
+    assert job.status == Job.PENDING
+    assert "битый файл" in job.last_error
+    assert job.run_after > timezone.now()
+
+    # Пауза ещё не прошла: повторный запуск задачу не трогает.
+    run_worker()
+    job.refresh_from_db()
+    assert job.attempts == 1
+
+    Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+    run_worker()
+    job.refresh_from_db()
+    assert job.status == Job.FAILED
+    assert job.attempts == 2
+
+
+def test_stale_job_returns_to_queue(post, settings):
+    job = enqueue("render_post_image", post_id=post.pk)
+    claim(1)
+    Job.objects.filter(pk=job.pk).update(
+        started_at=timezone.now() - timedelta(seconds=settings.BLOG_JOB_TIMEOUT + 1)
+    )
+    assert release_stale() == 1
+    job.refresh_from_db()
+    assert job.status == Job.PENDING
+
+
+def test_status_page_is_for_staff_only(user_client, admin_client, post):
+    enqueue("render_post_image", post_id=post.pk)
+    assert user_client.get("/jobs/").status_code == 403
+    response = admin_client.get("/jobs/")
+    assert response.status_code == 200
+    assert "В очереди: 1" in response.content.decode()
+
+
+def test_status_filter_is_kept_in_page_links(admin_client):
+    Job.objects.bulk_create(
+        Job(kind="render_post_image", payload={"post_id": 0})
+        for _ in range(51)
+    )
+    response = admin_client.get("/jobs/", {"status": Job.PENDING})
+    assert 'href="?status=pending&page=2"' in response.content.decode()
@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.models import Post
+from blog.paginators import KeysetPaginator
+from blog.views import get_feed, get_posts
+from conftest import N_PER_PAGE, get_with_queries
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def many_posts(mixer, user, published_category):
+    # Пары постов с одинаковой датой проверяют разрешение ничьих по id.
+    dates = (
+        timezone.now() - timedelta(hours=n // 2) for n in range(N_PER_PAGE * 2 + 5)
+    )
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=dates,
+    )
+
+
+def feed():
+    return get_feed(get_posts(Post.objects))
+
+
+def expected_order():
+    return list(feed().order_by("-pub_date", "id").values_list("id", flat=True))
+
+
+def test_walks_forward_and_back_without_gaps(many_posts):
+    paginator = KeysetPaginator(feed(), N_PER_PAGE)
+    pages = [paginator.get_page()]
+    while pages[-1].has_next():
+        pages.append(paginator.get_page(after=pages[-1].next_cursor))
+
+    seen = [post.id for page in pages for post in page]
+    assert seen == expected_order()
+    assert not pages[0].has_previous()
+
+    back = paginator.get_page(before=pages[-1].previous_cursor)
+    assert [post.id for post in back] == [post.id for post in pages[-2]]
+
+
+def test_broken_cursor_falls_back_to_first_page(many_posts):
+    paginator = KeysetPaginator(feed(), N_PER_PAGE)
+    page = paginator.get_page(after="не-курсор")
+    assert [post.id for post in page] == expected_order()[:N_PER_PAGE]
+
+
+def future_cursor(paginator):
+    return paginator.encode_cursor(
+        {"pub_date": timezone.now() + timedelta(days=1), "id": 0}
+    )
+
+
+def test_empty_backwards_page_falls_back_to_first_page(many_posts):
+    paginator = KeysetPaginator(feed(), N_PER_PAGE)
+    page = paginator.get_page(before=future_cursor(paginator))
+    assert [post.id for post in page] == expected_order()[:N_PER_PAGE]
+    assert page.has_next()
+    assert not page.has_previous()
+
+
+@override_settings(BLOG_KEYSET_PAGINATION=True)
+def test_stale_before_cursor_shows_first_page(client, many_posts):
+    cursor = future_cursor(KeysetPaginator(feed(), N_PER_PAGE))
+    response = client.get("/", {"before": cursor})
+    assert response.status_code == 200
+    assert len(response.context["page_obj"]) == N_PER_PAGE
+
+
+@override_settings(BLOG_KEYSET_PAGINATION=True)
+def test_deep_page_costs_the_same_as_first(client, many_posts):
+    response, first = get_with_queries(client, "/")
+    cursor = response.context["page_obj"].next_cursor
+    assert f"?after={cursor}" in response.content.decode()
+
+    response, deep = get_with_queries(client, f"/?after={cursor}")
+    assert response.status_code == 200
+    # Агрегат для ETag, выборка страницы и срок кэша до ближайшей
+    # отложенной публикации.
+    assert len(deep) == len(first) == 3
@@ -0,0 +1,47 @@
+import pytest
+
+from conftest import get_with_queries
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_queries(client, url):
+    response, queries = get_with_queries(client, url)
+    assert response.status_code == 200
+    return response, len(queries)
+
+
+def test_anonymous_pages_are_served_from_cache(client, page_urls):
+    for url in page_urls:
+        first, _ = count_queries(client, url)
+        cached, queries = count_queries(client, url)
+        assert queries == 0, url
+        assert cached.content == first.content
+
+
+def test_authenticated_users_bypass_cache(user_client, page_urls):
+    for url in page_urls:
+        count_queries(user_client, url)
+        _, queries = count_queries(user_client, url)
+        assert queries > 0, url
+
+
+def test_cache_is_invalidated_by_new_comment(
+    client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    client.get(url)
+    comment = mixer.blend("blog.Comment", post=post, text="Свежий комментарий")
+    response, queries = count_queries(client, url)
+    assert queries > 0
+    assert comment.text in response.content.decode()
+
+
+def test_cache_is_invalidated_by_category_change(client, post_with_published_location):
+    category = post_with_published_location.category
+    url = f"/category/{category.slug}/"
+    client.get(url)
+    category.is_published = False
+    category.save()
+    assert client.get(url).status_code == 404
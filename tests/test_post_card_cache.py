@@ -0,0 +1,51 @@
+import pytest
+from django.test import override_settings
+
+from blog.cache import fragment_stats
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_cards_are_reused_between_renders(user_client, feed_posts):
+    user_client.get("/")
+    assert fragment_stats() == {"hits": 0, "misses": N_PER_PAGE, "hit_rate": 0.0}
+
+    user_client.get("/")
+    assert fragment_stats() == {
+        "hits": N_PER_PAGE,
+        "misses": N_PER_PAGE,
+        "hit_rate": 0.5,
+    }
+
+
+@override_settings(BLOG_FRAGMENT_CACHE_STATS=False)
+def test_hits_are_not_counted_when_stats_are_off(user_client, feed_posts):
+    user_client.get("/")
+    user_client.get("/")
+    assert fragment_stats() == {"hits": 0, "misses": 0, "hit_rate": 0.0}
+
+
+def test_card_is_rerendered_after_post_change(user_client, mixer, feed_posts):
+    post = feed_posts[0]
+    user_client.get("/")
+
+    post.title = "Новый заголовок"
+    post.save()
+    mixer.blend("blog.Comment", post=feed_posts[1])
+    content = user_client.get("/").content.decode()
+
+    assert "Новый заголовок" in content
+    assert "Комментарии (1)" in content
+    assert fragment_stats()["hits"] == N_PER_PAGE - 2
+
+
+def test_card_is_rerendered_after_category_change(user_client, feed_posts):
+    category = feed_posts[0].category
+    user_client.get(f"/profile/{feed_posts[0].author.username}/")
+
+    category.is_published = False
+    category.save()
+    response = user_client.get(f"/profile/{feed_posts[0].author.username}/")
+
+    assert "Выбранная категория снята с публикации" in response.content.decode()
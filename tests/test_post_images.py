@@ -0,0 +1,167 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import Client, TestCase
+from PIL import Image
+
+from blog import uploadhandlers
+from blog.images import rendition_name
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("media_root")]
+
+
+def make_image(width, height, image_format="PNG", mode="RGB", **options):
+    buffer = BytesIO()
+    Image.new(mode, (width, height), "navy").save(buffer, image_format, **options)
+    extension = image_format.lower()
+    return SimpleUploadedFile(
+        f"photo.{extension}", buffer.getvalue(), content_type=f"image/{extension}"
+    )
+
+
+def run_worker():
+    call_command("run_worker", workers=0, once=True)
+
+
+def create_post(client, category, location, image):
+    send_post(client, category, location, image)
+    run_worker()
+    return Post.objects.get(title="С фото")
+
+
+def send_post(client, category, location, image):
+    # Задача на копии ставится после фиксации транзакции.
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        return client.post(
+            "/posts/create/",
+            data={
+                "title": "С фото",
+                "text": "Текст",
+                "pub_date": "2020-01-01T10:00",
+                "category": category.pk,
+                "location": location.pk,
+                "is_published": True,
+                "image": image,
+            },
+        )
+
+
+def test_renditions_are_created_by_worker(
+    user_client, published_category, published_location
+):
+    post = create_post(
+        user_client, published_category, published_location, make_image(2000, 1000)
+    )
+
+    assert post.image_renditions == {"card": 640, "detail": 960, "full": 1600}
+    for rendition, width in post.image_renditions.items():
+        for extension in ("jpg", "webp"):
+            name = rendition_name(post.image.name, rendition, extension)
+            with default_storage.open(name) as file, Image.open(file) as image:
+                assert image.width == width
+
+    content = user_client.get(f"/posts/{post.id}/").content.decode()
+    assert 'type="image/webp"' in content
+    assert "_card.jpg 640w" in content
+
+
+def test_small_image_is_not_upscaled(
+    user_client, published_category, published_location
+):
+    image = make_image(300, 200, mode="RGBA")
+    post = create_post(user_client, published_category, published_location, image)
+    assert post.image_renditions == {"card": 300}
+
+
+def test_backfill_command(published_category, user):
+    post = Post.objects.create(
+        title="Старая",
+        text="Текст",
+        pub_date="2020-01-01T10:00Z",
+        author=user,
+        category=published_category,
+        image=make_image(1000, 500, "JPEG"),
+    )
+    assert post.image_renditions == {}
+
+    call_command("render_post_images")
+
+    post.refresh_from_db()
+    assert post.image_renditions == {"card": 640, "detail": 960, "full": 1000}
+
+
+def test_exif_is_stripped_and_orientation_applied(
+    user_client, published_category, published_location
+):
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: повернуть на 90° по часовой стрелке
+    exif[0x010F] = "Телефон"  # Make
+    image = make_image(200, 100, "JPEG", exif=exif.tobytes())
+
+    post = create_post(user_client, published_category, published_location, image)
+
+    with post.image.open() as file, Image.open(file) as stored:
+        assert stored.size == (100, 200)
+        assert not stored.getexif()
+
+
+def test_too_many_pixels_are_rejected(
+    user_client, published_category, published_location, settings
+):
+    settings.BLOG_IMAGE_MAX_PIXELS = 100 * 100
+    response = send_post(
+        user_client, published_category, published_location, make_image(101, 100)
+    )
+    assert "мегапикселей" in response.context["form"].errors["image"][0]
+    assert not Post.objects.exists()
+
+
+def test_oversize_file_is_skipped_while_streaming(
+    user_client, published_category, published_location, settings
+):
+    image = make_image(300, 300, "BMP")
+    settings.BLOG_IMAGE_MAX_UPLOAD_SIZE = image.size - 1
+    response = send_post(user_client, published_category, published_location, image)
+    assert "слишком большой" in response.context["form"].errors["image"][0]
+    assert not Post.objects.exists()
+
+
+def test_oversize_request_is_rejected_by_content_length(
+    user_client, published_category, published_location, settings, monkeypatch
+):
+    monkeypatch.setattr(uploadhandlers, "FORM_FIELDS_ALLOWANCE", 0)
+    settings.BLOG_IMAGE_MAX_UPLOAD_SIZE = 1024
+    response = send_post(
+        user_client, published_category, published_location, make_image(300, 300)
+    )
+    assert response.status_code == 413
+    assert not Post.objects.exists()
+
+
+def test_csrf_is_still_checked(user, published_category, published_location):
+    client = Client(enforce_csrf_checks=True)
+    client.force_login(user)
+    response = send_post(
+        client, published_category, published_location, make_image(10, 10)
+    )
+    assert response.status_code == 403
+
+
+def test_upload_is_not_parsed_without_permission(
+    client, user_client, post_of_another_author, published_location
+):
+    category = post_of_another_author.category
+    response = send_post(client, category, published_location, make_image(10, 10))
+    assert response.status_code == 302
+    assert not hasattr(response.wsgi_request, "_files")
+
+    response = user_client.post(
+        f"/posts/{post_of_another_author.id}/edit/",
+        data={"title": "Чужой", "image": make_image(10, 10)},
+    )
+    assert response.status_code == 302
+    assert not hasattr(response.wsgi_request, "_files")
@@ -0,0 +1,54 @@
+import pytest
+from django.core.cache import cache
+
+from blog.cache import card_version, content_version
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_username_is_resolved_once_per_author(
+    django_assert_num_queries, post_with_published_location
+):
+    expected = f"/profile/{post_with_published_location.author.username}/"
+    post = Post.objects.get(pk=post_with_published_location.pk)
+    cache.clear()
+    with django_assert_num_queries(1):
+        assert post.get_absolute_url() == expected
+
+    post = Post.objects.get(pk=post.pk)
+    with django_assert_num_queries(0):
+        assert post.get_absolute_url() == expected
+
+
+def test_absolute_url_uses_loaded_author(
+    django_assert_num_queries, mixer, user, post_with_published_location
+):
+    comment = mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+    comment = Comment.objects.select_related("author").get(pk=comment.pk)
+    with django_assert_num_queries(0):
+        assert comment.get_absolute_url() == f"/profile/{user.username}/"
+
+
+def test_username_change_refreshes_profile_url(user, post_with_published_location):
+    post = Post.objects.get(pk=post_with_published_location.pk)
+    post.get_absolute_url()
+    user.username = "renamed"
+    user.save()
+    post = Post.objects.get(pk=post.pk)
+    assert post.get_absolute_url() == "/profile/renamed/"
+
+
+def test_profile_save_without_rename_keeps_caches(user):
+    cache.clear()
+    versions = card_version(), content_version()
+    user.first_name = "Иван"
+    user.save()
+    assert (card_version(), content_version()) == versions
+
+    user.username = "renamed"
+    user.save()
+    assert card_version() != versions[0]
+    assert content_version() != versions[1]
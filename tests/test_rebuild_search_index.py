@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.utils import timezone
+
+from blog.models import Post
+from blog.search import SEARCH_TABLE, post_batches, search_posts
+
+pytestmark = [pytest.mark.django_db]
+
+
+def clear_index():
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+
+
+def index_rows():
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT rowid, * FROM {SEARCH_TABLE} ORDER BY rowid")
+        return cursor.fetchall()
+
+
+def found(query):
+    return set(search_posts(Post.objects, query).values_list("title", flat=True))
+
+
+@pytest.fixture
+def posts(mixer):
+    old, new = mixer.cycle(2).blend("blog.Post", title=(t for t in ("Кот", "Кошка")))
+    Post.objects.filter(pk=old.pk).update(
+        created_at=timezone.now() - timedelta(days=30)
+    )
+    clear_index()
+    return old, new
+
+
+def test_full_rebuild(posts):
+    call_command("rebuild_search_index", batch_size=1)
+    assert found("кот") == {"Кот"}
+    assert found("кошки") == {"Кошка"}
+
+
+def test_workers_build_the_same_index(mixer):
+    mixer.cycle(7).blend(
+        "blog.Post",
+        title=(f"Кошки и собаки, выпуск {number}" for number in range(7)),
+        text=(f"Рыжий кот спал {number} часов." for number in range(7)),
+    )
+    call_command("rebuild_search_index", batch_size=2)
+    expected = index_rows()
+    clear_index()
+
+    call_command("rebuild_search_index", batch_size=2, workers=2)
+    assert index_rows() == expected
+    assert len(expected) == 7
+
+
+def test_since_reindexes_only_new_posts(posts):
+    since = (timezone.now() - timedelta(days=1)).date().isoformat()
+    call_command("rebuild_search_index", since=since)
+    assert found("кот") == set()
+    assert found("кошки") == {"Кошка"}
+
+
+def test_batches_cover_every_post(posts):
+    batches = list(post_batches(Post.objects.all(), batch_size=1))
+    assert [pk for batch in batches for pk, _, _ in batch] == sorted(
+        post.pk for post in posts
+    )
+
+
+def test_bad_since_is_reported():
+    with pytest.raises(CommandError):
+        call_command("rebuild_search_index", since="вчера")
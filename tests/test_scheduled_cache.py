@@ -0,0 +1,43 @@
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from django.core.cache.backends import locmem
+from django.utils import timezone
+
+from blog.cache import timeout_until
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_timeout_until():
+    now = timezone.now()
+    assert timeout_until(None, 300) == 300
+    assert timeout_until(now + timedelta(seconds=30), 300) == 30
+    assert timeout_until(now + timedelta(hours=1), 300) == 300
+    assert timeout_until(now - timedelta(seconds=5), 300) == 1
+
+
+def test_feed_cache_expires_when_scheduled_post_goes_live(
+    client, mixer, monkeypatch, user, published_category, post_with_published_location
+):
+    scheduled = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(seconds=10),
+        title="Отложенная публикация",
+    )
+    assert scheduled.title not in client.get("/").content.decode()
+
+    # Публикация наступает без сохранения модели — сигналов не будет.
+    scheduled.__class__.objects.filter(pk=scheduled.pk).update(
+        pub_date=timezone.now() - timedelta(seconds=1)
+    )
+    assert scheduled.title not in client.get("/").content.decode()
+
+    later = time.time() + 11
+    monkeypatch.setattr(locmem, "time", SimpleNamespace(time=lambda: later))
+    assert scheduled.title in client.get("/").content.decode()
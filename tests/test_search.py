@@ -0,0 +1,108 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Post
+from blog.search import SEARCH_TABLE, search_posts, search_terms, snippet
+from blog.views import get_posts
+
+pytestmark = [pytest.mark.django_db]
+
+
+def found(query):
+    return list(
+        search_posts(get_posts(Post.objects), query)
+        .order_by("rank", "id")
+        .values_list("title", flat=True)
+    )
+
+
+def test_title_match_ranks_first(make_post):
+    make_post("Про погоду", "Сегодня во дворе гулял кот.")
+    make_post("Кот учёного", "Длинная история.")
+    assert found("кот") == ["Кот учёного", "Про погоду"]
+
+
+def test_only_published_posts_are_found(make_post):
+    make_post("Кот опубликован")
+    make_post("Кот скрыт", is_published=False)
+    make_post("Кот в будущем", pub_date=timezone.now() + timedelta(days=1))
+    assert found("кот") == ["Кот опубликован"]
+
+
+def test_index_follows_edits_and_deletes(make_post):
+    post = make_post("Кот")
+    post.title = "Пёс"
+    post.save()
+    assert found("кот") == []
+    assert found("пёс") == ["Пёс"]
+
+    post.delete()
+    assert found("пёс") == []
+
+
+def test_other_databases_skip_index(monkeypatch, make_post):
+    # Таблицы индекса там нет: сохранение и удаление не должны её трогать.
+    monkeypatch.setattr(connection, "vendor", "postgresql")
+    with CaptureQueriesContext(connection) as ctx:
+        post = make_post("Кот")
+        post.title = "Пёс"
+        post.save()
+        post.delete()
+    assert not any(SEARCH_TABLE in query["sql"] for query in ctx.captured_queries)
+
+
+def test_query_syntax_is_not_passed_to_fts(client, make_post):
+    make_post("Кот")
+    response = client.get("/search/", {"q": 'кот OR "NEAR(* :'})
+    assert response.status_code == 200
+
+
+def test_snippet_is_escaped_and_highlighted(client, make_post):
+    make_post("Заметка", "<script>alert(1)</script> рыжий кот спит")
+    content = client.get("/search/", {"q": "кот"}).content.decode()
+    assert "<script>" not in content
+    assert "&lt;script&gt;" in content
+    assert "<mark>кот</mark>" in content
+
+
+def test_results_are_paginated_by_cursor(client, make_post):
+    for number in range(15):
+        make_post(f"Кот номер {number}")
+
+    first = client.get("/search/", {"q": "кот"})
+    page = first.context["page_obj"]
+    assert len(page) == 10
+    assert f"?q=%D0%BA%D0%BE%D1%82&after={page.next_cursor}" in (
+        first.content.decode()
+    )
+
+    second = client.get("/search/", {"q": "кот", "after": page.next_cursor})
+    titles = [post.title for post in page] + [
+        post.title for post in second.context["page_obj"]
+    ]
+    assert len(set(titles)) == 15
+
+
+def test_inflected_forms_match(make_post):
+    make_post("Кошки", "Во дворе живут рыжие кошки.")
+    make_post("Ёлка", "Нарядили ёлку.")
+    assert found("кошкой") == ["Кошки"]
+    assert found("елками") == ["Ёлка"]
+
+
+def test_highlight_marks_inflected_words(client, make_post):
+    make_post("Про котов", "Рыжий кот спит, а другие коты играют.")
+    content = client.get("/search/", {"q": "котами"}).content.decode()
+    assert "Про <mark>котов</mark>" in content
+    assert "<mark>кот</mark> спит" in content
+    assert "<mark>коты</mark> играют" in content
+
+
+def test_snippet_keeps_text_around_first_and_last_words():
+    assert snippet("«Кот» спит.", search_terms("кот")) == (
+        "«<mark>Кот</mark>» спит."
+    )
@@ -0,0 +1,81 @@
+import importlib
+import os
+import subprocess
+import sys
+
+import pytest
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+DEBUG_PROCESSOR = "django.template.context_processors.debug"
+
+
+def load_production(monkeypatch, **environ):
+    for name, value in environ.items():
+        monkeypatch.setenv(name, value)
+    return importlib.reload(importlib.import_module("blogicum.settings.production"))
+
+
+def test_production_profile(monkeypatch):
+    production = load_production(monkeypatch, DJANGO_SECRET_KEY="secret")
+    assert production.DEBUG is False
+    assert production.SECRET_KEY == "secret"
+    assert not any("debug_toolbar" in app for app in production.INSTALLED_APPS)
+    assert not any("debug_toolbar" in name for name in production.MIDDLEWARE)
+    (template,) = production.TEMPLATES
+    assert template["APP_DIRS"] is False
+    assert DEBUG_PROCESSOR not in template["OPTIONS"]["context_processors"]
+    ((loader, _),) = template["OPTIONS"]["loaders"]
+    assert loader == "django.template.loaders.cached.Loader"
+    assert production.DATABASES["default"]["CONN_MAX_AGE"] == 60
+    # Профиль не должен менять общие настройки, на которых идут тесты.
+    assert settings.DATABASES["default"].get("CONN_MAX_AGE", 0) == 0
+    assert DEBUG_PROCESSOR in settings.TEMPLATES[0]["OPTIONS"]["context_processors"]
+
+    production = load_production(monkeypatch, DJANGO_CONN_MAX_AGE="0")
+    assert production.DATABASES["default"]["CONN_MAX_AGE"] == 0
+
+
+def test_production_cache_is_shared(monkeypatch):
+    production = load_production(monkeypatch, DJANGO_SECRET_KEY="secret")
+    assert production.CACHES["default"]["BACKEND"] == (
+        "django.core.cache.backends.db.DatabaseCache"
+    )
+
+    memcached = "django.core.cache.backends.memcached.PyMemcacheCache"
+    production = load_production(
+        monkeypatch,
+        DJANGO_CACHE_BACKEND=memcached,
+        DJANGO_CACHE_LOCATION="cache:11211",
+    )
+    assert production.CACHES["default"] == {
+        "BACKEND": memcached,
+        "LOCATION": "cache:11211",
+    }
+
+
+def test_production_requires_secret_key(monkeypatch):
+    monkeypatch.delenv("DJANGO_SECRET_KEY", raising=False)
+    with pytest.raises(ImproperlyConfigured):
+        load_production(monkeypatch)
+
+
+@pytest.mark.parametrize(
+    "profile, succeeds", [("production", True), ("staging", False)]
+)
+def test_profile_selected_by_environment(profile, succeeds):
+    result = subprocess.run(
+        [sys.executable, "manage.py", "check"],
+        cwd=settings.BASE_DIR,
+        env={
+            **os.environ,
+            "BLOGICUM_ENV": profile,
+            "DJANGO_SETTINGS_MODULE": "blogicum.settings",
+            "DJANGO_SECRET_KEY": "secret",
+        },
+        capture_output=True,
+        text=True,
+    )
+    assert (result.returncode == 0) is succeeds, result.stderr
+    if not succeeds:
+        assert "BLOGICUM_ENV" in result.stderr